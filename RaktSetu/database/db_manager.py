@@ -3,18 +3,44 @@ Database Manager
 Handles all database operations for BloodFlow AI
 """
 
-from sqlalchemy import create_engine, func
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy import create_engine, func, select, case, cast, Integer
+from sqlalchemy.orm import sessionmaker, scoped_session
 from datetime import datetime, timedelta
 from typing import List, Dict, Optional
 import pandas as pd
+import functools
+import itertools
+import orjson
+from contextlib import contextmanager
 
 from database.models import (
     Donor, Donation, BloodInventory, DemandHistory, 
     BloodUnit, Notification, EmergencyEvent, 
-    BlockchainRecord, PredictionLog, init_database
+    BlockchainRecord, PredictionLog, InventorySummary,
+    init_database, refresh_inventory_summary
 )
 
+# Rows per read_sql chunk when loading demand history
+DEMAND_HISTORY_CHUNK_SIZE = 10000
+
+# Narrow dtypes for demand history; actual_usage is nullable (manual records)
+DEMAND_HISTORY_DTYPES = {
+    'demand': 'int16',
+    'actual_usage': 'Int16',
+    'day_of_week': 'int8',
+    'month': 'int8'
+}
+
+
+def _invalidates_stats(method):
+    """Bump the stats version after a write so cached counts are recomputed"""
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        result = method(self, *args, **kwargs)
+        self._stats_version += 1
+        return result
+    return wrapper
+
 
 class DatabaseManager:
     """
@@ -23,122 +49,143 @@ class DatabaseManager:
     
     def __init__(self, db_path="sqlite:///bloodflow.db"):
         self.engine = init_database(db_path)
-        self.Session = sessionmaker(bind=self.engine)
+        # One session per thread, reused across calls on that thread
+        self.Session = scoped_session(sessionmaker(bind=self.engine))
+        
+        # Count queries are cached until a write through this manager
+        self._stats_version = 0
+        self._stats_cache = {}
+    
+    def _cached_stats(self, name, compute):
+        """Return a cached stats dict, recomputing it if anything was written since"""
+        cached = self._stats_cache.get(name)
+        if cached is None or cached[0] != self._stats_version:
+            cached = (self._stats_version, compute())
+            self._stats_cache[name] = cached
+        return dict(cached[1])
     
     def get_session(self):
         """Get a new database session"""
         return self.Session()
     
+    @contextmanager
+    def session_scope(self):
+        """Transactional scope: commit on success, roll back on error"""
+        session = self.Session()
+        try:
+            yield session
+            session.commit()
+        except:
+            session.rollback()
+            raise
+        finally:
+            session.close()
+    
     # ==================== DONOR OPERATIONS ====================
     
+    def _donor_stats_query(self, session):
+        """Donors joined with their donation count and last donation date
+
+        One aggregate subquery replaces the per-donor count/last-donation
+        lookups, so listing N donors is a single SELECT.
+        """
+        stats = session.query(
+            Donation.donor_id,
+            func.count(Donation.id).label('donation_count'),
+            func.max(Donation.donation_date).label('last_donation_date')
+        ).group_by(Donation.donor_id).subquery()
+        
+        # Days since last donation and eligibility arrive precomputed
+        days_since_last = cast(
+            func.julianday(datetime.now()) - func.julianday(stats.c.last_donation_date),
+            Integer
+        ).label('days_since_last_donation')
+        eligible = case(
+            (stats.c.last_donation_date.is_(None), True),
+            else_=days_since_last >= 90
+        ).label('eligible')
+        
+        query = session.query(
+            Donor, stats.c.donation_count, stats.c.last_donation_date,
+            days_since_last, eligible
+        ).outerjoin(stats, Donor.id == stats.c.donor_id)
+        return query, stats
+    
     def get_all_donors(self) -> List[Dict]:
         """Get all donors"""
-        session = self.get_session()
-        try:
-            donors = session.query(Donor).all()
-            return [self._donor_to_dict(d) for d in donors]
-        finally:
-            session.close()
+        with self.session_scope() as session:
+            query, _ = self._donor_stats_query(session)
+            return [self._donor_to_dict(*row) for row in query.all()]
     
     def get_donor_by_id(self, donor_id: str) -> Optional[Dict]:
         """Get donor by ID"""
-        session = self.get_session()
-        try:
-            donor = session.query(Donor).filter(Donor.donor_id == donor_id).first()
-            return self._donor_to_dict(donor) if donor else None
-        finally:
-            session.close()
+        with self.session_scope() as session:
+            query, _ = self._donor_stats_query(session)
+            row = query.filter(Donor.donor_id == donor_id).first()
+            return self._donor_to_dict(*row) if row else None
     
     def get_eligible_donors(self, blood_type: str = None) -> List[Dict]:
         """Get eligible donors (90+ days since last donation)"""
-        session = self.get_session()
-        try:
+        with self.session_scope() as session:
             ninety_days_ago = datetime.now() - timedelta(days=90)
             
-            query = session.query(Donor).join(Donation).group_by(Donor.id).having(
-                func.max(Donation.donation_date) <= ninety_days_ago
-            )
+            query, stats = self._donor_stats_query(session)
+            query = query.filter(stats.c.last_donation_date <= ninety_days_ago)
             
             if blood_type:
                 query = query.filter(Donor.blood_type == blood_type)
             
-            donors = query.all()
-            return [self._donor_to_dict(d) for d in donors]
-        finally:
-            session.close()
+            return [self._donor_to_dict(*row) for row in query.all()]
     
-    def _donor_to_dict(self, donor: Donor) -> Dict:
-        """Convert Donor object to dictionary"""
+    def _donor_to_dict(self, donor: Donor, donation_count: int = None,
+                       last_donation_date: datetime = None,
+                       days_since_last: int = None, eligible: bool = True) -> Dict:
+        """Convert Donor object (plus its precomputed donation stats) to dictionary"""
         if not donor:
             return None
         
-        session = self.get_session()
-        try:
-            # Get donation count
-            donation_count = session.query(Donation).filter(
-                Donation.donor_id == donor.id
-            ).count()
-            
-            # Get last donation
-            last_donation = session.query(Donation).filter(
-                Donation.donor_id == donor.id
-            ).order_by(Donation.donation_date.desc()).first()
-            
-            days_since_last = None
-            if last_donation:
-                days_since_last = (datetime.now() - last_donation.donation_date).days
-            
-            return {
-                'donor_id': donor.donor_id,
-                'blood_type': donor.blood_type,
-                'age': donor.age,
-                'gender': donor.gender,
-                'location': donor.location,
-                'total_donations': donation_count,
-                'last_donation_date': last_donation.donation_date if last_donation else None,
-                'days_since_last_donation': days_since_last,
-                'eligible': days_since_last >= 90 if days_since_last else True,
-                'emergency_available': donor.emergency_available,
-                'contact_preference': donor.contact_preference
-            }
-        finally:
-            session.close()
+        return {
+            'donor_id': donor.donor_id,
+            'blood_type': donor.blood_type,
+            'age': donor.age,
+            'gender': donor.gender,
+            'location': donor.location,
+            'total_donations': donation_count or 0,
+            'last_donation_date': last_donation_date,
+            'days_since_last_donation': days_since_last,
+            'eligible': bool(eligible),
+            'emergency_available': donor.emergency_available,
+            'contact_preference': donor.contact_preference
+        }
     
     # ==================== INVENTORY OPERATIONS ====================
     
     def get_inventory_status(self, blood_type: str = None) -> List[Dict]:
         """Get current inventory status"""
-        session = self.get_session()
-        try:
+        with self.session_scope() as session:
             query = session.query(BloodInventory)
             if blood_type:
                 query = query.filter(BloodInventory.blood_type == blood_type)
             
             inventories = query.all()
             return [self._inventory_to_dict(inv) for inv in inventories]
-        finally:
-            session.close()
     
     def update_inventory(self, blood_type: str, current_stock: int):
         """Update inventory stock level"""
-        session = self.get_session()
         try:
-            inventory = session.query(BloodInventory).filter(
-                BloodInventory.blood_type == blood_type
-            ).first()
+            with self.session_scope() as session:
+                inventory = session.query(BloodInventory).filter(
+                    BloodInventory.blood_type == blood_type
+                ).first()
             
-            if inventory:
-                inventory.current_stock = current_stock
-                inventory.last_updated = datetime.now()
-                session.commit()
-                return True
-            return False
+                if inventory:
+                    inventory.current_stock = current_stock
+                    inventory.last_updated = datetime.now()
+                    return True
+                return False
         except Exception as e:
-            session.rollback()
             print(f"Error updating inventory: {e}")
             return False
-        finally:
-            session.close()
     
     def _inventory_to_dict(self, inv: BloodInventory) -> Dict:
         """Convert BloodInventory to dictionary"""
@@ -154,178 +201,298 @@ class DatabaseManager:
             'last_updated': inv.last_updated
         }
     
+    def get_inventory_summary(self) -> List[Dict]:
+        """Pre-aggregated unit counts per blood type (one row each, no joins)"""
+        with self.session_scope() as session:
+            summaries = session.query(InventorySummary).all()
+            if not summaries:
+                refresh_inventory_summary(session)
+                summaries = session.query(InventorySummary).all()
+            
+            return [{
+                'blood_type': summary.blood_type,
+                'available': summary.available,
+                'reserved': summary.reserved,
+                'expiring_7d': summary.expiring_7d,
+                'expiring_30d': summary.expiring_30d,
+                'updated_at': summary.updated_at
+            } for summary in summaries]
+    
+    def refresh_inventory_summary(self):
+        """Rebuild the summary table from blood_units"""
+        try:
+            with self.session_scope() as session:
+                refresh_inventory_summary(session)
+                return True
+        except Exception as e:
+            print(f"Error refreshing inventory summary: {e}")
+            return False
+    
     # ==================== DEMAND HISTORY OPERATIONS ====================
     
     def get_demand_history(self, blood_type: str, days: int = 365) -> pd.DataFrame:
         """Get historical demand data for ML training"""
-        session = self.get_session()
-        try:
-            start_date = datetime.now() - timedelta(days=days)
-            
-            records = session.query(DemandHistory).filter(
-                DemandHistory.blood_type == blood_type,
-                DemandHistory.date >= start_date
-            ).order_by(DemandHistory.date).all()
-            
-            data = [{
-                'date': r.date,
-                'demand': r.demand,
-                'actual_usage': r.actual_usage,
-                'day_of_week': r.day_of_week,
-                'month': r.month,
-                'is_weekend': r.is_weekend,
-                'is_holiday': r.is_holiday
-            } for r in records]
-            
-            return pd.DataFrame(data)
-        finally:
-            session.close()
+        start_date = datetime.now() - timedelta(days=days)
+        
+        # Read rows straight into columns, skipping ORM objects and dicts
+        stmt = select(
+            DemandHistory.date,
+            DemandHistory.demand,
+            DemandHistory.actual_usage,
+            DemandHistory.day_of_week,
+            DemandHistory.month,
+            DemandHistory.is_weekend,
+            DemandHistory.is_holiday
+        ).where(
+            DemandHistory.blood_type == blood_type,
+            DemandHistory.date >= start_date
+        ).order_by(DemandHistory.date)
+        
+        # Stream in chunks so long ranges never hold every row as Python objects
+        with self.engine.connect() as conn:
+            chunks = list(pd.read_sql(stmt, conn, chunksize=DEMAND_HISTORY_CHUNK_SIZE))
+        if not chunks:
+            chunks = [pd.DataFrame(columns=[column.name for column in stmt.selected_columns])]
+        return pd.concat(chunks, ignore_index=True).astype(DEMAND_HISTORY_DTYPES)
     
+    @_invalidates_stats
     def add_demand_record(self, blood_type: str, date: datetime, demand: int):
         """Add a demand history record"""
-        session = self.get_session()
         try:
-            record = DemandHistory(
-                date=date,
-                blood_type=blood_type,
-                demand=demand,
-                day_of_week=date.weekday(),
-                month=date.month,
-                is_weekend=date.weekday() >= 5
-            )
-            session.add(record)
-            session.commit()
-            return True
+            with self.session_scope() as session:
+                record = DemandHistory(
+                    date=date,
+                    blood_type=blood_type,
+                    demand=demand,
+                    day_of_week=date.weekday(),
+                    month=date.month,
+                    is_weekend=date.weekday() >= 5
+                )
+                session.add(record)
+                return True
         except Exception as e:
-            session.rollback()
             print(f"Error adding demand record: {e}")
             return False
-        finally:
-            session.close()
     
     # ==================== NOTIFICATION OPERATIONS ====================
     
+    @_invalidates_stats
     def add_notification(self, notif_data: Dict):
         """Add notification to database"""
-        session = self.get_session()
         try:
-            notification = Notification(
-                notification_type=notif_data.get('type'),
-                recipient_type=notif_data.get('recipient_type', 'donor'),
-                recipient_id=notif_data.get('recipient_id'),
-                subject=notif_data.get('subject'),
-                message=notif_data.get('message'),
-                channel=notif_data.get('channel', 'email'),
-                priority=notif_data.get('priority', 'medium'),
-                status='sent'
-            )
-            session.add(notification)
-            session.commit()
-            return True
+            with self.session_scope() as session:
+                notification = Notification(
+                    notification_type=notif_data.get('type'),
+                    recipient_type=notif_data.get('recipient_type', 'donor'),
+                    recipient_id=notif_data.get('recipient_id'),
+                    subject=notif_data.get('subject'),
+                    message=notif_data.get('message'),
+                    channel=notif_data.get('channel', 'email'),
+                    priority=notif_data.get('priority', 'medium'),
+                    status='sent'
+                )
+                session.add(notification)
+                return True
         except Exception as e:
-            session.rollback()
             print(f"Error adding notification: {e}")
             return False
-        finally:
-            session.close()
     
     def get_notification_stats(self) -> Dict:
         """Get notification statistics"""
-        session = self.get_session()
-        try:
-            total = session.query(Notification).count()
-            
-            by_type = {}
-            types = session.query(Notification.notification_type, 
-                                func.count(Notification.id)).group_by(
-                                    Notification.notification_type).all()
-            for notif_type, count in types:
-                by_type[notif_type] = count
+        return self._cached_stats('notifications', self._query_notification_stats)
+    
+    def _query_notification_stats(self) -> Dict:
+        with self.session_scope() as session:
+            # One grouped scan; the total is the sum of the groups
+            by_type = dict(session.query(Notification.notification_type, 
+                                         func.count(Notification.id)).group_by(
+                                             Notification.notification_type).all())
             
             return {
-                'total': total,
+                'total': sum(by_type.values()),
                 'by_type': by_type
             }
-        finally:
-            session.close()
     
     # ==================== EMERGENCY OPERATIONS ====================
     
+    @_invalidates_stats
     def create_emergency_event(self, event_type: str, severity: str, 
                                blood_types: List[str], description: str = None) -> int:
         """Create emergency event record"""
-        session = self.get_session()
         try:
-            event = EmergencyEvent(
-                event_type=event_type,
-                severity=severity,
-                blood_types_needed=','.join(blood_types),
-                description=description,
-                status='active'
-            )
-            session.add(event)
-            session.commit()
-            return event.id
+            with self.session_scope() as session:
+                event = EmergencyEvent(
+                    event_type=event_type,
+                    severity=severity,
+                    blood_types_needed=','.join(blood_types),
+                    description=description,
+                    status='active'
+                )
+                session.add(event)
+                session.flush()  # assigns event.id
+                return event.id
         except Exception as e:
-            session.rollback()
             print(f"Error creating emergency event: {e}")
             return None
-        finally:
-            session.close()
     
     def update_emergency_event(self, event_id: int, donors_contacted: int = None, 
                                units_collected: int = None):
         """Update emergency event"""
-        session = self.get_session()
         try:
-            event = session.query(EmergencyEvent).filter(
-                EmergencyEvent.id == event_id
-            ).first()
+            with self.session_scope() as session:
+                event = session.query(EmergencyEvent).filter(
+                    EmergencyEvent.id == event_id
+                ).first()
             
-            if event:
-                if donors_contacted is not None:
-                    event.donors_contacted = donors_contacted
-                if units_collected is not None:
-                    event.units_collected = units_collected
-                session.commit()
-                return True
-            return False
+                if event:
+                    if donors_contacted is not None:
+                        event.donors_contacted = donors_contacted
+                    if units_collected is not None:
+                        event.units_collected = units_collected
+                    return True
+                return False
         except Exception as e:
-            session.rollback()
             print(f"Error updating emergency event: {e}")
             return False
-        finally:
-            session.close()
     
     # ==================== BLOCKCHAIN OPERATIONS ====================
     
+    @_invalidates_stats
     def add_blockchain_record(self, block_index: int, block_hash: str, 
                              previous_hash: str, transaction_data: str):
         """Add blockchain record to database"""
-        session = self.get_session()
         try:
-            record = BlockchainRecord(
-                block_index=block_index,
-                block_hash=block_hash,
-                previous_hash=previous_hash,
-                data=transaction_data
-            )
-            session.add(record)
-            session.commit()
-            return True
+            with self.session_scope() as session:
+                record = BlockchainRecord(
+                    block_index=block_index,
+                    block_hash=block_hash,
+                    previous_hash=previous_hash,
+                    data=transaction_data
+                )
+                session.add(record)
+                return True
         except Exception as e:
-            session.rollback()
             print(f"Error adding blockchain record: {e}")
             return False
-        finally:
-            session.close()
+    
+    @_invalidates_stats
+    def add_block(self, block: Dict):
+        """Persist a mined block as one row per transaction"""
+        # The genesis block has no transactions; store its data as the one row
+        transactions = block["data"].get("transactions", [block["data"]])
+        
+        try:
+            with self.session_scope() as session:
+                session.execute(BlockchainRecord.__table__.insert(), [
+                    {
+                        'block_index': block["index"],
+                        'block_hash': block["hash"],
+                        'previous_hash': block["previous_hash"],
+                        'timestamp': datetime.fromisoformat(block["timestamp"]),
+                        'transaction_type': transaction.get("type"),
+                        'unit_id': transaction.get("unit_id"),
+                        # Compact sorted-key JSON: the bytes the block hash covers
+                        'data': orjson.dumps(transaction, option=orjson.OPT_SORT_KEYS).decode(),
+                        'nonce': block["nonce"]
+                    }
+                    for transaction in transactions
+                ])
+                return True
+        except Exception as e:
+            print(f"Error adding block: {e}")
+            return False
+    
+    def get_blocks(self) -> List[Dict]:
+        """Every persisted block, in chain order, shaped like Block.to_dict()"""
+        with self.session_scope() as session:
+            records = session.query(
+                BlockchainRecord.block_index,
+                BlockchainRecord.block_hash,
+                BlockchainRecord.previous_hash,
+                BlockchainRecord.timestamp,
+                BlockchainRecord.transaction_type,
+                BlockchainRecord.data,
+                BlockchainRecord.nonce
+            ).order_by(BlockchainRecord.block_index, BlockchainRecord.id).all()
+        
+        # One row per transaction; regroup them into their blocks
+        blocks = []
+        for (block_index, block_hash), rows in itertools.groupby(
+                records, key=lambda r: (r.block_index, r.block_hash)):
+            rows = list(rows)
+            first = rows[0]
+            if first.transaction_type == 'genesis':
+                data = orjson.loads(first.data)
+            else:
+                data = {'transactions': [orjson.loads(r.data) for r in rows]}
+            blocks.append({
+                'index': block_index,
+                'timestamp': first.timestamp.isoformat(timespec="microseconds"),
+                'data': data,
+                'previous_hash': first.previous_hash,
+                'hash': block_hash,
+                'nonce': first.nonce
+            })
+        return blocks
+    
+    def get_unit_history(self, unit_id: str) -> List[Dict]:
+        """All blockchain transactions for one unit, in chain order (index seek)"""
+        with self.session_scope() as session:
+            records = session.query(
+                BlockchainRecord.block_index, BlockchainRecord.block_hash, BlockchainRecord.data
+            ).filter(
+                BlockchainRecord.unit_id == unit_id
+            ).order_by(BlockchainRecord.block_index, BlockchainRecord.id).all()
+            
+            return [{
+                'block_index': r.block_index,
+                'block_hash': r.block_hash,
+                'transaction': orjson.loads(r.data)
+            } for r in records]
+    
+    def get_units_by_status(self, status: str) -> List[str]:
+        """Units with any transaction in the given status"""
+        with self.session_scope() as session:
+            rows = session.query(BlockchainRecord.unit_id).filter(
+                BlockchainRecord.status == status
+            ).distinct().all()
+            return [unit_id for unit_id, in rows]
+    
+    def get_audit_trail(self, start_date: str, end_date: str) -> List[Dict]:
+        """Transactions in blocks mined between two ISO dates"""
+        # Both bounds bound to ix_bcrec_ts, so only the window's slice of the
+        # index is read, and it already comes out in timestamp order
+        with self.session_scope() as session:
+            records = session.query(
+                BlockchainRecord.block_index,
+                func.json_extract(BlockchainRecord.data, '$.timestamp'),
+                BlockchainRecord.transaction_type,
+                BlockchainRecord.unit_id,
+                BlockchainRecord.status,
+                BlockchainRecord.block_hash
+            ).filter(
+                BlockchainRecord.timestamp >= datetime.fromisoformat(start_date),
+                BlockchainRecord.timestamp <= datetime.fromisoformat(end_date),
+                BlockchainRecord.transaction_type != 'genesis'
+            ).order_by(BlockchainRecord.timestamp, BlockchainRecord.id).all()
+            
+            return [{
+                'block': block_index,
+                'timestamp': timestamp,
+                'type': transaction_type,
+                'unit_id': unit_id,
+                'status': status,
+                'block_hash': block_hash
+            } for block_index, timestamp, transaction_type, unit_id, status, block_hash in records]
     
     # ==================== STATISTICS ====================
     
     def get_database_stats(self) -> Dict:
         """Get overall database statistics"""
-        session = self.get_session()
-        try:
+        return self._cached_stats('database', self._query_database_stats)
+    
+    def _query_database_stats(self) -> Dict:
+        with self.session_scope() as session:
             stats = {
                 'total_donors': session.query(Donor).count(),
                 'total_donations': session.query(Donation).count(),
@@ -335,9 +502,23 @@ class DatabaseManager:
                 'total_blockchain_records': session.query(BlockchainRecord).count()
             }
             return stats
-        finally:
-            session.close()
 
 
-# Global database manager instance
-db_manager = DatabaseManager()
+# Global database manager instance, created on first use so importing this
+# module does not open (or create) the database file
+_db_manager = None
+
+
+def get_db_manager() -> DatabaseManager:
+    """Return the shared DatabaseManager, creating it on first call"""
+    global _db_manager
+    if _db_manager is None:
+        _db_manager = DatabaseManager()
+    return _db_manager
+
+
+def __getattr__(name):
+    # Keeps `from database.db_manager import db_manager` working
+    if name == "db_manager":
+        return get_db_manager()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
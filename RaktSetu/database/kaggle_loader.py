@@ -6,8 +6,7 @@ Downloads and imports blood donation datasets from Kaggle
 import pandas as pd
 import numpy as np
 from datetime import datetime, timedelta
-import random
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, func, update, bindparam
 from sqlalchemy.orm import sessionmaker
 import sys
 import os
@@ -20,6 +19,39 @@ from database.models import (
     BloodUnit, init_database, get_session
 )
 
+# Arrow's multithreaded CSV parser when pyarrow is installed
+try:
+    import pyarrow
+    CSV_ENGINE = "pyarrow"
+except ImportError:
+    CSV_ENGINE = "c"
+
+# SQLAlchemy's SQLite DateTime storage format, for rows written without the ORM
+SQLITE_DATETIME_FORMAT = "%Y-%m-%d %H:%M:%S.%f"
+
+# Blood types in a fixed order, with per-type arrays indexed the same way
+BLOOD_TYPES = ("O+", "A+", "B+", "AB+", "O-", "A-", "B-", "AB-")
+BLOOD_TYPE_PROBS = np.array([0.38, 0.34, 0.09, 0.03, 0.07, 0.06, 0.02, 0.01])
+BASE_DAILY_DEMAND = np.array([40, 35, 25, 10, 15, 12, 8, 5], dtype=float)
+
+# Narrow dtypes for donor frames. Synthetic ranges are known (recency <= 24,
+# donations <= 25, months <= 60); loaded CSVs keep int16 headroom.
+DONOR_CATEGORY_DTYPES = {'blood_type': 'category', 'gender': 'category', 'location': 'category'}
+SYNTHETIC_DONOR_DTYPES = {
+    **DONOR_CATEGORY_DTYPES,
+    'age': 'int8',
+    'recency_months': 'int8',
+    'total_donations': 'int16',
+    'months_active': 'int16'
+}
+LOADED_DONOR_DTYPES = {
+    **DONOR_CATEGORY_DTYPES,
+    'age': 'int8',
+    'recency_months': 'int16',
+    'total_donations': 'int16',
+    'months_active': 'int16'
+}
+
 
 class KaggleDataLoader:
     """
@@ -35,6 +67,19 @@ class KaggleDataLoader:
         self.engine = init_database(db_path)
         self.Session = sessionmaker(bind=self.engine)
     
+    def _raw_insert(self, cursor, model, frame):
+        """
+        executemany straight on the DB-API cursor for bulk loads, skipping
+        ORM bookkeeping; frame columns name the table columns
+        """
+        columns = ", ".join(frame.columns)
+        placeholders = ", ".join("?" * len(frame.columns))
+        cursor.executemany(
+            f"INSERT INTO {model.__tablename__} ({columns}) VALUES ({placeholders})",
+            frame.itertuples(index=False, name=None)
+        )
+        return len(frame)
+    
     def load_from_csv(self, csv_path: str):
         """
         Load data from CSV file
@@ -45,7 +90,7 @@ class KaggleDataLoader:
         print(f"Loading data from {csv_path}...")
         
         try:
-            df = pd.read_csv(csv_path)
+            df = pd.read_csv(csv_path, engine=CSV_ENGINE)
             print(f"✓ Loaded {len(df)} records from CSV")
             return df
         except FileNotFoundError:
@@ -66,32 +111,39 @@ class KaggleDataLoader:
         print("Loading Blood Transfusion Dataset...")
         
         try:
-            df = pd.read_csv(csv_path)
+            df = pd.read_csv(csv_path, engine=CSV_ENGINE)
             
             # Map to our schema
             # Recency = months since last donation
             # Frequency = total donations
             # Time = months since first donation
             
-            donors = []
-            blood_types = ["O+", "A+", "B+", "AB+", "O-", "A-", "B-", "AB-"]
-            blood_type_probs = [0.38, 0.34, 0.09, 0.03, 0.07, 0.06, 0.02, 0.01]
+            n = len(df)
+            rng = np.random.default_rng()
+            
+            def column(name, position, default):
+                # Named column, else positional, else a constant; all int32
+                if name in df.columns:
+                    return df[name].to_numpy(dtype=np.int32)
+                if df.shape[1] > position:
+                    return df.iloc[:, position].to_numpy(dtype=np.int32)
+                return np.full(n, default, dtype=np.int32)
+            
+            donors = pd.DataFrame({
+                'donor_id': [f'D{i+1:05d}' for i in range(n)],
+                'blood_type': rng.choice(BLOOD_TYPES, size=n, p=BLOOD_TYPE_PROBS),
+                'age': rng.integers(18, 66, n),
+                'gender': rng.choice(['M', 'F'], n),
+                'location': rng.choice(['north', 'south', 'east', 'west', 'central'], n),
+                'recency_months': column('Recency (months)', 0, 6),
+                'total_donations': column('Frequency (times)', 1, 5),
+                'months_active': column('Time (months)', 3, 24)
+            })
             
-            for idx, row in df.iterrows():
-                donor_data = {
-                    'donor_id': f'D{idx+1:05d}',
-                    'blood_type': np.random.choice(blood_types, p=blood_type_probs),
-                    'age': random.randint(18, 65),
-                    'gender': random.choice(['M', 'F']),
-                    'location': random.choice(['north', 'south', 'east', 'west', 'central']),
-                    'recency_months': row.get('Recency (months)', row.iloc[0] if len(row) > 0 else 6),
-                    'total_donations': row.get('Frequency (times)', row.iloc[1] if len(row) > 1 else 5),
-                    'months_active': row.get('Time (months)', row.iloc[3] if len(row) > 3 else 24)
-                }
-                donors.append(donor_data)
+            donors = donors.astype(LOADED_DONOR_DTYPES)
             
             print(f"✓ Processed {len(donors)} donor records")
-            return pd.DataFrame(donors)
+            return donors
             
         except FileNotFoundError:
             print(f"⚠️  Kaggle dataset not found at {csv_path}")
@@ -109,169 +161,167 @@ class KaggleDataLoader:
         """
         print(f"Generating synthetic data: {num_donors} donors, {num_days_history} days history...")
         
-        blood_types = ["O+", "A+", "B+", "AB+", "O-", "A-", "B-", "AB-"]
-        blood_type_probs = [0.38, 0.34, 0.09, 0.03, 0.07, 0.06, 0.02, 0.01]
+        rng = np.random.default_rng()
         locations = ['north', 'south', 'east', 'west', 'central']
         
-        donors_data = []
+        recency_months = rng.integers(0, 25, num_donors)
         
-        for i in range(num_donors):
-            blood_type = np.random.choice(blood_types, p=blood_type_probs)
-            total_donations = random.randint(1, 25)
-            recency_months = random.randint(0, 24)
-            
-            donor = {
-                'donor_id': f'D{i+1:05d}',
-                'blood_type': blood_type,
-                'age': random.randint(18, 65),
-                'gender': random.choice(['M', 'F', 'O']),
-                'location': random.choice(locations),
-                'contact_preference': random.choice(['sms', 'email', 'app', 'whatsapp']),
-                'emergency_available': random.choice([True, False]),
-                'recency_months': recency_months,
-                'total_donations': total_donations,
-                'months_active': random.randint(recency_months, 60)
-            }
-            donors_data.append(donor)
+        donors_data = pd.DataFrame({
+            'donor_id': [f'D{i+1:05d}' for i in range(num_donors)],
+            'blood_type': rng.choice(BLOOD_TYPES, size=num_donors, p=BLOOD_TYPE_PROBS),
+            'age': rng.integers(18, 66, num_donors),
+            'gender': rng.choice(['M', 'F', 'O'], num_donors),
+            'location': rng.choice(locations, num_donors),
+            'contact_preference': rng.choice(['sms', 'email', 'app', 'whatsapp'], num_donors),
+            'emergency_available': rng.choice([True, False], num_donors),
+            'recency_months': recency_months,
+            'total_donations': rng.integers(1, 26, num_donors),
+            'months_active': rng.integers(recency_months, 61)
+        })
+        
+        donors_data = donors_data.astype(SYNTHETIC_DONOR_DTYPES)
         
         print(f"✓ Generated {len(donors_data)} synthetic donor records")
-        return pd.DataFrame(donors_data)
+        return donors_data
     
     def import_donors_to_db(self, df):
         """Import donor data to database"""
-        session = self.Session()
+        raw = self.engine.raw_connection()
         
         try:
             print("Importing donors to database...")
+            cursor = raw.cursor()
             
             # Clear existing donors (for fresh import)
-            session.query(Donor).delete()
-            session.query(Donation).delete()
-            session.commit()
+            cursor.execute(f"DELETE FROM {Donor.__tablename__}")
+            cursor.execute(f"DELETE FROM {Donation.__tablename__}")
             
-            donors_added = 0
-            donations_added = 0
+            # Columns absent from the source fall back to the same defaults
+            # the old per-row import used
+            donor_defaults = {
+                'age': 30, 'gender': 'M', 'location': 'central',
+                'contact_preference': 'email', 'emergency_available': False
+            }
+            donor_columns = ['donor_id', 'blood_type', *donor_defaults]
+            now = datetime.now()
+            timestamp = now.strftime(SQLITE_DATETIME_FORMAT)
+            donors = df.assign(**{
+                col: default for col, default in donor_defaults.items() if col not in df.columns
+            })[donor_columns].assign(created_at=timestamp, updated_at=timestamp)
+
+            # One batched INSERT for all donors, then one SELECT for their keys
+            donors_added = self._raw_insert(cursor, Donor, donors)
+            cursor.execute(f"SELECT donor_id, id FROM {Donor.__tablename__}")
+            id_map = dict(cursor.fetchall())
+
+            # Create donation history (every ~4 months back from recency)
+            donation_defaults = {'total_donations': 5, 'recency_months': 3, 'location': 'Main Blood Bank'}
+            history = df.assign(**{
+                col: default for col, default in donation_defaults.items() if col not in df.columns
+            })[['donor_id', 'blood_type', *donation_defaults]]
+
+            # Fan each donor out to total_donations rows; position within
+            # the donor's run gives how many ~4-month steps back it is
+            counts = history['total_donations'].astype(int).to_numpy()
+            run_index = np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts, counts)
+            months_ago = np.repeat(history['recency_months'].astype(int).to_numpy(), counts) + run_index * 4
             
-            for _, row in df.iterrows():
-                # Create donor
-                donor = Donor(
-                    donor_id=row['donor_id'],
-                    blood_type=row['blood_type'],
-                    age=row.get('age', 30),
-                    gender=row.get('gender', 'M'),
-                    location=row.get('location', 'central'),
-                    contact_preference=row.get('contact_preference', 'email'),
-                    emergency_available=row.get('emergency_available', False)
-                )
-                session.add(donor)
-                session.flush()  # Get the donor ID
-                
-                donors_added += 1
-                
-                # Create donation history
-                total_donations = int(row.get('total_donations', 5))
-                recency_months = int(row.get('recency_months', 3))
-                
-                for i in range(total_donations):
-                    # Calculate donation date
-                    months_ago = recency_months + (i * 4)  # Every ~4 months
-                    donation_date = datetime.now() - timedelta(days=months_ago * 30)
-                    
-                    donation = Donation(
-                        donor_id=donor.id,
-                        donation_date=donation_date,
-                        blood_type=row['blood_type'],
-                        volume_ml=450,
-                        location=row.get('location', 'Main Blood Bank')
-                    )
-                    session.add(donation)
-                    donations_added += 1
+            donations = pd.DataFrame({
+                'donor_id': np.repeat(history['donor_id'].map(id_map).to_numpy(), counts),
+                'donation_date': (pd.Timestamp(now) - pd.to_timedelta(months_ago * 30, unit='D'))
+                                 .strftime(SQLITE_DATETIME_FORMAT),
+                'blood_type': np.repeat(history['blood_type'].to_numpy(), counts),
+                'volume_ml': 450,
+                'location': np.repeat(history['location'].to_numpy(), counts)
+            })
+            donations_added = self._raw_insert(cursor, Donation, donations)
             
-            session.commit()
+            raw.commit()
             print(f"✓ Imported {donors_added} donors")
             print(f"✓ Imported {donations_added} donation records")
             
         except Exception as e:
-            session.rollback()
+            raw.rollback()
             print(f"❌ Error importing donors: {str(e)}")
         finally:
-            session.close()
+            raw.close()
     
     def generate_demand_history(self, days=365):
         """Generate historical demand data for ML training"""
-        session = self.Session()
+        raw = self.engine.raw_connection()
         
         try:
             print(f"Generating {days} days of demand history...")
+            cursor = raw.cursor()
             
             # Clear existing history
-            session.query(DemandHistory).delete()
-            session.commit()
-            
-            blood_types = ["O+", "A+", "B+", "AB+", "O-", "A-", "B-", "AB-"]
-            base_demands = {
-                "O+": 40, "A+": 35, "B+": 25, "O-": 15,
-                "A-": 12, "AB+": 10, "B-": 8, "AB-": 5
-            }
+            cursor.execute(f"DELETE FROM {DemandHistory.__tablename__}")
             
             end_date = datetime.now()
             start_date = end_date - timedelta(days=days)
+            dates = pd.date_range(start=start_date, end=end_date, freq='D')
             
-            records_added = 0
+            # Whole (blood type x day) demand matrix in one pass
+            rng = np.random.default_rng()
+            shape = (len(BLOOD_TYPES), len(dates))
+            day_of_week = dates.weekday.to_numpy()
+            month = dates.month.to_numpy()
+            is_weekend = day_of_week >= 5
             
-            for blood_type in blood_types:
-                base_demand = base_demands[blood_type]
-                current_date = start_date
-                
-                while current_date <= end_date:
-                    # Calculate demand with variations
-                    demand = base_demand
-                    
-                    # Day of week effect
-                    if current_date.weekday() < 5:  # Weekday
-                        demand *= random.uniform(1.1, 1.3)
-                    else:  # Weekend
-                        demand *= random.uniform(0.7, 0.9)
-                    
-                    # Monthly seasonal effect
-                    month = current_date.month
-                    if month in [6, 7, 8]:  # Monsoon
-                        demand *= random.uniform(1.2, 1.4)
-                    elif month in [10, 11]:  # Festival season
-                        demand *= random.uniform(1.15, 1.35)
-                    
-                    # Random events (5% chance of spike)
-                    if random.random() < 0.05:
-                        demand *= random.uniform(1.5, 2.5)
-                    
-                    # General variation
-                    demand *= random.uniform(0.85, 1.15)
-                    demand = max(1, int(round(demand)))
-                    
-                    # Create record
-                    record = DemandHistory(
-                        date=current_date,
-                        blood_type=blood_type,
-                        demand=demand,
-                        actual_usage=int(demand * random.uniform(0.8, 1.0)),
-                        day_of_week=current_date.weekday(),
-                        month=current_date.month,
-                        is_weekend=current_date.weekday() >= 5,
-                        is_holiday=False
-                    )
-                    session.add(record)
-                    records_added += 1
-                    
-                    current_date += timedelta(days=1)
+            # Each factor is low + width * U(0, 1); low/width depend only on
+            # the day, so they are 1-D and broadcast across blood types. One
+            # scratch buffer is refilled in place and folded into `factor`.
+            is_monsoon = np.isin(month, [6, 7, 8])
+            is_festival = np.isin(month, [10, 11])
+            factor_bounds = [
+                # Day of week effect
+                (np.where(is_weekend, 0.7, 1.1), 0.2),
+                # Monthly seasonal effect (monsoon, festival season)
+                (np.select([is_monsoon, is_festival], [1.2, 1.15], 1.0),
+                 np.where(is_monsoon | is_festival, 0.2, 0.0)),
+            ]
             
-            session.commit()
+            # General variation
+            factor = rng.uniform(0.85, 1.15, shape)
+            scratch = np.empty(shape)
+            for low, width in factor_bounds:
+                rng.random(out=scratch)
+                scratch *= width
+                scratch += low
+                factor *= scratch
+            
+            # Random events (5% chance of spike)
+            spikes = rng.random(shape) < 0.05
+            factor[spikes] *= rng.uniform(1.5, 2.5, spikes.sum())
+            
+            factor *= BASE_DAILY_DEMAND[:, None]
+            demand = np.maximum(1, np.rint(factor, out=factor)).astype(np.int32)
+            actual_usage = (demand * rng.uniform(0.8, 1.0, shape)).astype(np.int32)
+            
+            # Rows are blood-type major: each type's run of days in order
+            num_types = len(BLOOD_TYPES)
+            history = pd.DataFrame({
+                'date': np.tile(dates.strftime(SQLITE_DATETIME_FORMAT), num_types),
+                'blood_type': np.repeat(BLOOD_TYPES, len(dates)),
+                'demand': demand.ravel(),
+                'actual_usage': actual_usage.ravel(),
+                'location': "Main Blood Bank",
+                'day_of_week': np.tile(day_of_week, num_types),
+                'month': np.tile(month, num_types),
+                'is_weekend': np.tile(is_weekend, num_types),
+                'is_holiday': False,
+                'created_at': datetime.now().strftime(SQLITE_DATETIME_FORMAT)
+            })
+            records_added = self._raw_insert(cursor, DemandHistory, history)
+            
+            raw.commit()
             print(f"✓ Generated {records_added} demand history records")
             
         except Exception as e:
-            session.rollback()
+            raw.rollback()
             print(f"❌ Error generating demand history: {str(e)}")
         finally:
-            session.close()
+            raw.close()
     
     def update_inventory_from_donations(self):
         """Update current inventory based on recent donations"""
@@ -280,27 +330,26 @@ class KaggleDataLoader:
         try:
             print("Updating inventory from donations...")
             
-            blood_types = ["O+", "A+", "B+", "AB+", "O-", "A-", "B-", "AB-"]
-            
-            for blood_type in blood_types:
-                # Count recent donations (last 30 days)
-                thirty_days_ago = datetime.now() - timedelta(days=30)
-                
-                recent_donations = session.query(Donation).filter(
-                    Donation.blood_type == blood_type,
+            # Count recent donations (last 30 days) for every type at once
+            thirty_days_ago = datetime.now() - timedelta(days=30)
+            recent_donations = dict(
+                session.query(Donation.blood_type, func.count(Donation.id)).filter(
                     Donation.donation_date >= thirty_days_ago
-                ).count()
-                
-                # Update inventory
-                inventory = session.query(BloodInventory).filter(
-                    BloodInventory.blood_type == blood_type
-                ).first()
-                
-                if inventory:
-                    # Simulate current stock (recent donations - usage)
-                    usage_rate = 0.7  # 70% of donations are used
-                    inventory.current_stock = int(recent_donations * (1 - usage_rate))
-                    inventory.last_updated = datetime.now()
+                ).group_by(Donation.blood_type).all()
+            )
+            
+            # Simulate current stock (recent donations - usage); one executemany UPDATE
+            usage_rate = 0.7  # 70% of donations are used
+            now = datetime.now()
+            session.execute(
+                update(BloodInventory.__table__)
+                .where(BloodInventory.__table__.c.blood_type == bindparam('bt'))
+                .values(current_stock=bindparam('stock'), last_updated=now),
+                [
+                    {'bt': blood_type, 'stock': int(recent_donations.get(blood_type, 0) * (1 - usage_rate))}
+                    for blood_type in BLOOD_TYPES
+                ]
+            )
             
             session.commit()
             print("✓ Inventory updated")
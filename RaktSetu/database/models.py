@@ -3,10 +3,11 @@ Database Models for BloodFlow AI
 SQLAlchemy ORM models for persistent storage
 """
 
-from sqlalchemy import create_engine, Column, Integer, String, Float, DateTime, Boolean, ForeignKey, Text
+from sqlalchemy import create_engine, event, inspect, update, insert, select, func, case, Computed, Column, Integer, String, Float, DateTime, Boolean, ForeignKey, Text, Index
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import sessionmaker, relationship
-from datetime import datetime
+from sqlalchemy.orm import sessionmaker, relationship, deferred, Session
+from sqlalchemy.schema import CreateColumn
+from datetime import datetime, timedelta
 
 Base = declarative_base()
 
@@ -45,6 +46,11 @@ class Donation(Base):
     
     # Relationships
     donor = relationship("Donor", back_populates="donations")
+    
+    __table_args__ = (
+        Index('ix_donation_donor_date', 'donor_id', 'donation_date'),
+        Index('ix_donation_bt_date', 'blood_type', 'donation_date'),
+    )
 
 
 class BloodInventory(Base):
@@ -52,7 +58,7 @@ class BloodInventory(Base):
     __tablename__ = 'blood_inventory'
     
     id = Column(Integer, primary_key=True)
-    blood_type = Column(String(5), nullable=False, unique=True)
+    blood_type = Column(String(5), nullable=False, unique=True)  # UNIQUE doubles as the lookup index
     current_stock = Column(Integer, default=0)
     safety_stock = Column(Integer, nullable=False)
     optimal_stock = Column(Integer, nullable=False)
@@ -70,12 +76,25 @@ class BloodUnit(Base):
     donor_id = Column(Integer, ForeignKey('donors.id'))
     collection_date = Column(DateTime, nullable=False)
     expiry_date = Column(DateTime, nullable=False)
-    status = Column(String(20), default='available')  # available, reserved, used, expired
+    status = Column(String(20), default='available', index=True)  # available, reserved, used, expired
     location = Column(String(100))
     blockchain_hash = Column(String(256))
     created_at = Column(DateTime, default=datetime.now)
 
 
+class InventorySummary(Base):
+    """Per-blood-type unit counts, kept current by an after_flush hook"""
+    __tablename__ = 'inventory_summary'
+    
+    id = Column(Integer, primary_key=True)
+    blood_type = Column(String(5), nullable=False, unique=True)
+    available = Column(Integer, default=0)
+    reserved = Column(Integer, default=0)
+    expiring_7d = Column(Integer, default=0)  # available units expiring within 7 days
+    expiring_30d = Column(Integer, default=0)
+    updated_at = Column(DateTime, default=datetime.now)
+
+
 class DemandHistory(Base):
     """Historical demand data for ML training"""
     __tablename__ = 'demand_history'
@@ -92,6 +111,13 @@ class DemandHistory(Base):
     is_holiday = Column(Boolean, default=False)
     weather_condition = Column(String(50))
     created_at = Column(DateTime, default=datetime.now)
+    
+    # ix_demand_bt_date: "all rows for blood_type X ordered by date" - ML
+    # training extraction and get_demand_history(blood_type, days) become an
+    # index range scan that also yields rows already sorted by date
+    __table_args__ = (
+        Index('ix_demand_bt_date', 'blood_type', 'date'),
+    )
 
 
 class Notification(Base):
@@ -103,7 +129,7 @@ class Notification(Base):
     recipient_type = Column(String(50))  # donor, staff, hospital
     recipient_id = Column(String(100))
     subject = Column(String(200))
-    message = Column(Text, nullable=False)
+    message = deferred(Column(Text, nullable=False))  # loaded on first access
     channel = Column(String(20))  # sms, email, app_push, whatsapp
     priority = Column(String(20))  # critical, high, medium, low
     status = Column(String(20), default='sent')  # sent, delivered, failed
@@ -118,7 +144,7 @@ class EmergencyEvent(Base):
     id = Column(Integer, primary_key=True)
     event_type = Column(String(50), nullable=False)  # accident, disaster, outbreak
     severity = Column(String(20), nullable=False)  # low, medium, high, critical
-    description = Column(Text)
+    description = deferred(Column(Text))  # loaded on first access
     blood_types_needed = Column(String(100))  # Comma-separated
     units_needed = Column(Integer)
     donors_contacted = Column(Integer)
@@ -139,8 +165,20 @@ class BlockchainRecord(Base):
     timestamp = Column(DateTime, default=datetime.now)
     transaction_type = Column(String(50))  # COLLECTION, TESTING, STORAGE, TRANSFER, TRANSFUSION
     unit_id = Column(String(50))
-    data = Column(Text)  # JSON string of transaction data
+    data = deferred(Column(Text))  # JSON string of transaction data, loaded on first access
     nonce = Column(Integer, default=0)
+    # Derived from the stored JSON by SQLite itself, so it can't drift from data
+    status = Column(String(20), Computed("json_extract(data, '$.status')", persisted=False))
+    
+    # Per-unit history, per-type/status lookups and audit date ranges seek
+    # instead of scanning the chain; on SQLite the timestamp B-tree plays the
+    # role of monthly partitions, a range query touches only its window
+    __table_args__ = (
+        Index('ix_bcrec_unit', 'unit_id'),
+        Index('ix_bcrec_type', 'transaction_type'),
+        Index('ix_bcrec_status', 'status'),
+        Index('ix_bcrec_ts', 'timestamp'),
+    )
 
 
 class PredictionLog(Base):
@@ -155,13 +193,159 @@ class PredictionLog(Base):
     confidence_score = Column(Float)
     model_version = Column(String(50))
     created_at = Column(DateTime, default=datetime.now)
+    
+    # ix_pred_bt_date: per-blood-type prediction timelines, e.g. lining
+    # predictions up against demand_history for accuracy monitoring
+    __table_args__ = (
+        Index('ix_pred_bt_date', 'blood_type', 'prediction_date'),
+    )
+
+
+# Inventory summary maintenance
+SUMMARY_COUNTERS = ('available', 'reserved', 'expiring_7d', 'expiring_30d')
+
+
+def _unit_summary_counts(status, expiry_date, now):
+    """What one blood unit contributes to its summary row"""
+    available = status == 'available'
+    expiring = available and expiry_date is not None and expiry_date >= now
+    return (
+        int(available),
+        int(status == 'reserved'),
+        int(expiring and expiry_date <= now + timedelta(days=7)),
+        int(expiring and expiry_date <= now + timedelta(days=30))
+    )
+
+
+def _previous_value(state, key):
+    """Attribute value as of the last load/flush, before pending changes"""
+    history = state.attrs[key].history
+    if history.deleted:
+        return history.deleted[0]
+    if history.unchanged:
+        return history.unchanged[0]
+    return getattr(state.obj(), key)
+
+
+@event.listens_for(Session, "after_flush")
+def _apply_inventory_summary_deltas(session, flush_context):
+    """Turn new/changed/deleted BloodUnits into counter deltas on inventory_summary"""
+    now = datetime.now()
+    deltas = {}
+    
+    def add(blood_type, counts, sign):
+        totals = deltas.setdefault(blood_type, [0] * len(SUMMARY_COUNTERS))
+        for i, count in enumerate(counts):
+            totals[i] += sign * count
+    
+    for unit in session.new:
+        if isinstance(unit, BloodUnit):
+            add(unit.blood_type, _unit_summary_counts(unit.status, unit.expiry_date, now), 1)
+    for unit in session.deleted:
+        if isinstance(unit, BloodUnit):
+            state = inspect(unit)
+            add(_previous_value(state, 'blood_type'),
+                _unit_summary_counts(_previous_value(state, 'status'),
+                                     _previous_value(state, 'expiry_date'), now), -1)
+    for unit in session.dirty:
+        if isinstance(unit, BloodUnit) and session.is_modified(unit):
+            state = inspect(unit)
+            add(_previous_value(state, 'blood_type'),
+                _unit_summary_counts(_previous_value(state, 'status'),
+                                     _previous_value(state, 'expiry_date'), now), -1)
+            add(unit.blood_type, _unit_summary_counts(unit.status, unit.expiry_date, now), 1)
+    
+    # Core statements on the flush's own connection, so this commits or
+    # rolls back together with the unit changes
+    connection = session.connection()
+    table = InventorySummary.__table__
+    for blood_type, totals in deltas.items():
+        if not any(totals):
+            continue
+        values = {name: table.c[name] + delta for name, delta in zip(SUMMARY_COUNTERS, totals)}
+        result = connection.execute(
+            update(table).where(table.c.blood_type == blood_type).values(updated_at=now, **values)
+        )
+        if result.rowcount == 0:
+            connection.execute(insert(table).values(
+                blood_type=blood_type, updated_at=now, **dict(zip(SUMMARY_COUNTERS, totals))
+            ))
+
+
+def refresh_inventory_summary(session):
+    """
+    Rebuild inventory_summary from blood_units in one GROUP BY
+    
+    The after_flush deltas keep available/reserved exact, but units age
+    into the expiry windows without being written, so run this
+    periodically (e.g. daily) to re-anchor the expiring_* buckets.
+    """
+    now = datetime.now()
+    available = BloodUnit.status == 'available'
+    expiring = available & (BloodUnit.expiry_date >= now)
+    counts = session.execute(
+        select(
+            BloodUnit.blood_type,
+            func.sum(case((available, 1), else_=0)),
+            func.sum(case((BloodUnit.status == 'reserved', 1), else_=0)),
+            func.sum(case((expiring & (BloodUnit.expiry_date <= now + timedelta(days=7)), 1), else_=0)),
+            func.sum(case((expiring & (BloodUnit.expiry_date <= now + timedelta(days=30)), 1), else_=0))
+        ).group_by(BloodUnit.blood_type)
+    ).all()
+    by_type = {row[0]: row[1:] for row in counts}
+    
+    # Every stocked blood type gets a row, even with no tracked units yet
+    blood_types = set(session.scalars(select(BloodInventory.blood_type))) | set(by_type)
+    
+    table = InventorySummary.__table__
+    session.execute(table.delete())
+    if blood_types:
+        session.execute(insert(table), [
+            dict(blood_type=blood_type, updated_at=now,
+                 **dict(zip(SUMMARY_COUNTERS, by_type.get(blood_type, (0, 0, 0, 0)))))
+            for blood_type in sorted(blood_types)
+        ])
 
 
 # Database initialization
+SQLITE_PRAGMAS = (
+    "PRAGMA journal_mode=WAL",
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA cache_size=-131072",  # 128 MB
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA mmap_size=268435456",
+)
+
+
+def _set_sqlite_pragmas(dbapi_connection, connection_record):
+    """WAL + relaxed sync so bulk writes are not bound by fsync"""
+    cursor = dbapi_connection.cursor()
+    for pragma in SQLITE_PRAGMAS:
+        cursor.execute(pragma)
+    cursor.close()
+
+
 def init_database(db_path="sqlite:///bloodflow.db"):
     """Initialize database and create all tables"""
     engine = create_engine(db_path, echo=False)
+    if engine.dialect.name == "sqlite":
+        event.listen(engine, "connect", _set_sqlite_pragmas)
     Base.metadata.create_all(engine)
+    
+    # create_all skips tables that already exist; add any columns and
+    # indexes they lack (new columns must be nullable or VIRTUAL generated)
+    inspector = inspect(engine)
+    with engine.begin() as conn:
+        for table in Base.metadata.sorted_tables:
+            existing = {column["name"] for column in inspector.get_columns(table.name)}
+            for column in table.columns:
+                if column.name not in existing:
+                    conn.exec_driver_sql(
+                        f"ALTER TABLE {table.name} ADD COLUMN {CreateColumn(column).compile(engine)}"
+                    )
+    for table in Base.metadata.sorted_tables:
+        for index in table.indexes:
+            index.create(engine, checkfirst=True)
     return engine
 
 
@@ -195,15 +379,18 @@ def populate_initial_data(session):
         "AB-": {"safety": 10, "optimal": 15}
     }
     
-    for blood_type, config in blood_types_config.items():
-        inventory = BloodInventory(
-            blood_type=blood_type,
-            current_stock=0,  # Will be updated from Kaggle data
-            safety_stock=config["safety"],
-            optimal_stock=config["optimal"]
-        )
-        session.add(inventory)
+    # One executemany INSERT for all rows instead of one per session.add()
+    session.execute(insert(BloodInventory), [
+        {
+            "blood_type": blood_type,
+            "current_stock": 0,  # Will be updated from Kaggle data
+            "safety_stock": config["safety"],
+            "optimal_stock": config["optimal"]
+        }
+        for blood_type, config in blood_types_config.items()
+    ])
     
+    refresh_inventory_summary(session)
     session.commit()
     print("✓ Initial inventory data added")
 
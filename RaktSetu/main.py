@@ -14,7 +14,7 @@ sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
 from models.demand_predictor import BloodDemandPredictor
 from models.inventory_optimizer import InventoryOptimizer
-from models.blockchain_traceability import blood_blockchain, BloodUnitBlockchain
+from models.blockchain_traceability import get_blockchain, BloodUnitBlockchain
 from models.donor_intelligence import DonorIntelligence
 from models.notification_system import SmartNotificationSystem, NotificationType
 from utils.data_generator import generate_historical_data
@@ -22,7 +22,7 @@ from utils.data_generator import generate_historical_data
 # Database imports
 from database.models import init_database, populate_initial_data, get_session
 from database.kaggle_loader import KaggleDataLoader
-from database.db_manager import db_manager
+from database.db_manager import get_db_manager
 
 
 def initialize_database():
@@ -57,7 +57,7 @@ def initialize_database():
     else:
         print("✓ Database found - using existing data")
         # Verify database
-        stats = db_manager.get_database_stats()
+        stats = get_db_manager().get_database_stats()
         print(f"  Donors: {stats['total_donors']}")
         print(f"  Donations: {stats['total_donations']}")
         print(f"  Demand Records: {stats['total_demand_records']}")
@@ -91,6 +91,13 @@ notification_system = SmartNotificationSystem()
 print("✓ All systems ready!\n")
 
 
+@app.on_event("shutdown")
+def flush_blockchain():
+    """Mine transactions still waiting in the batch so none are lost on exit"""
+    if get_blockchain.cache_info().currsize:
+        get_blockchain().flush()
+
+
 # Pydantic Models
 class BloodType(BaseModel):
     blood_type: str = Field(..., description="Blood type (A+, A-, B+, B-, AB+, AB-, O+, O-)")
@@ -231,11 +238,7 @@ async def get_inventory_status(blood_type: Optional[str] = None):
         all_blood_types = ["A+", "A-", "B+", "B-", "AB+", "AB-", "O+", "O-"]
         blood_types_to_check = [blood_type] if blood_type else all_blood_types
         
-        statuses = []
-        
-        for bt in blood_types_to_check:
-            status = optimizer.get_inventory_status(bt)
-            statuses.append(status)
+        statuses = optimizer.get_all_statuses(blood_types_to_check)
         
         return {
             "timestamp": datetime.now(),
@@ -386,15 +389,15 @@ async def create_blood_unit(donor_id: str, blood_type: str, collection_date: str
     Returns unique blockchain ID for traceability
     """
     try:
-        unit_id = blood_blockchain.create_blood_unit(
+        blockchain = get_blockchain()
+        unit_id = blockchain.create_blood_unit(
             donor_id=donor_id,
             blood_type=blood_type,
             collection_date=collection_date,
             location=location
         )
-        
-        # Mine the transaction
-        blood_blockchain.mine_pending_transactions()
+        # Mine and persist before reporting success
+        blockchain.flush()
         
         return {
             "status": "success",
@@ -415,8 +418,9 @@ async def get_unit_history(unit_id: str):
     Returns all transactions from collection to transfusion
     """
     try:
-        history = blood_blockchain.get_unit_history(unit_id)
-        verification = blood_blockchain.verify_unit_authenticity(unit_id)
+        blockchain = get_blockchain()
+        history = blockchain.get_unit_history(unit_id)
+        verification = blockchain.verify_unit_authenticity(unit_id)
         
         return {
             "unit_id": unit_id,
@@ -433,7 +437,8 @@ async def get_unit_history(unit_id: str):
 async def add_testing_record(unit_id: str, test_passed: bool, tested_by: str):
     """Add testing results to blockchain"""
     try:
-        blood_blockchain.add_testing_record(
+        blockchain = get_blockchain()
+        blockchain.add_testing_record(
             unit_id=unit_id,
             test_results={
                 "passed": test_passed,
@@ -441,6 +446,7 @@ async def add_testing_record(unit_id: str, test_passed: bool, tested_by: str):
                 "tests_performed": ["HIV", "Hepatitis B", "Hepatitis C", "Syphilis"]
             }
         )
+        blockchain.flush()
         
         return {
             "status": "success",
@@ -455,12 +461,14 @@ async def add_testing_record(unit_id: str, test_passed: bool, tested_by: str):
 async def transfer_blood_unit(unit_id: str, from_location: str, to_location: str, transported_by: str):
     """Record blood unit transfer on blockchain"""
     try:
-        blood_blockchain.add_transfer_record(
+        blockchain = get_blockchain()
+        blockchain.add_transfer_record(
             unit_id=unit_id,
             from_location=from_location,
             to_location=to_location,
             transported_by=transported_by
         )
+        blockchain.flush()
         
         return {
             "status": "success",
@@ -477,7 +485,7 @@ async def transfer_blood_unit(unit_id: str, from_location: str, to_location: str
 async def get_blockchain_info():
     """Get blockchain statistics and health"""
     try:
-        info = blood_blockchain.get_chain_info()
+        info = get_blockchain().get_chain_info()
         return {
             "blockchain_info": info,
             "timestamp": datetime.now()
@@ -733,10 +741,7 @@ async def activate_emergency_mode(event_type: str, blood_types_needed: List[str]
             notification_system.send_notification(notification)
         
         # Get current inventory
-        inventory_status = []
-        for bt in blood_types_needed:
-            status = optimizer.get_inventory_status(bt)
-            inventory_status.append(status)
+        inventory_status = optimizer.get_all_statuses(blood_types_needed)
         
         return {
             "status": "EMERGENCY_MODE_ACTIVE",
@@ -759,11 +764,10 @@ async def get_emergency_status():
     """Get current emergency response status"""
     try:
         # Get critical inventory items
-        all_statuses = []
-        for blood_type in ["A+", "A-", "B+", "B-", "AB+", "AB-", "O+", "O-"]:
-            status = optimizer.get_inventory_status(blood_type)
-            if status["urgency_level"] in ["critical", "high"]:
-                all_statuses.append(status)
+        all_statuses = [
+            status for status in optimizer.get_all_statuses()
+            if status["urgency_level"] in ["critical", "high"]
+        ]
         
         # Get emergency-ready donors
         emergency_donors = len(donor_intel.donors[
@@ -4,51 +4,194 @@ Immutable tracking of blood units from donor to transfusion
 """
 
 import hashlib
-import json
-from datetime import datetime
+from datetime import datetime, timedelta
+from bisect import bisect_left, bisect_right
 from typing import List, Dict, Optional
+from collections import defaultdict
 import uuid
+import time
+import functools
+import operator
+import os
+
+import orjson
+
+
+def _canonical_json(obj) -> bytes:
+    """Canonical block encoding: sorted keys, compact separators, UTF-8 bytes"""
+    return orjson.dumps(obj, option=orjson.OPT_SORT_KEYS)
+
+
+# Nonces tried per call of the inner mining loop
+MINING_BATCH_SIZE = 4096
+
+# Secret key (at most 64 bytes) for patient ID hashes, so they cannot be
+# reversed by hashing candidate IDs; unset falls back to an unkeyed hash
+PATIENT_HASH_KEY = os.environ.get("PATIENT_HASH_KEY", "").encode()
+
+# Pending transactions are mined together once either threshold is hit
+FLUSH_INTERVAL_TXNS = 32
+FLUSH_INTERVAL_SECS = 5
+
+
+def _search_nonces(prefix_hasher, suffix: bytes, start: int, count: int, difficulty: int):
+    """
+    Try nonces start .. start+count-1 against a pre-hashed prefix
+
+    Returns (nonce, hex digest) for the first hash with `difficulty`
+    leading zero hex digits, or None. The test is an integer shift on
+    the raw digest; only the winning digest is converted to hex.
+    """
+    copy = prefix_hasher.copy
+    # Leading zero nibbles == the top 4*difficulty bits of the digest are 0
+    width = (4 * difficulty + 7) // 8
+    shift = 8 * width - 4 * difficulty
+    from_bytes = int.from_bytes
+    for nonce in range(start, start + count):
+        hasher = copy()
+        hasher.update(b"%d%s" % (nonce, suffix))
+        digest = hasher.digest()
+        if not from_bytes(digest[:width], "big") >> shift:
+            return nonce, digest.hex()
+    return None
+
+
+_EPOCH = datetime(1970, 1, 1)
+
+# (epoch second, ISO text of that second) for _now_iso()
+_clock = (None, "")
+
+
+def _now_iso() -> str:
+    """
+    Local time as ISO text, always with 6 fractional digits
+
+    Same as datetime.now().isoformat(timespec="microseconds"); unlike plain
+    isoformat(), ".000000" is kept when the microsecond is 0.
+
+    The date/time part is formatted once per second; other calls only
+    append the microsecond field to the cached text.
+    """
+    global _clock
+    second, micros = divmod(time.time_ns() // 1000, 1_000_000)
+    if second != _clock[0]:
+        _clock = (second, datetime.fromtimestamp(second).isoformat())
+    return f"{_clock[1]}.{micros:06d}"
+
+
+def _local_naive(iso_timestamp: str) -> datetime:
+    """
+    Parse an ISO timestamp as naive local time, like block timestamps
+    
+    Aware inputs ("Z" or "+05:30" offsets) are converted to local time
+    and their tzinfo dropped, so they compare with naive block times.
+    """
+    if iso_timestamp.endswith("Z"):
+        iso_timestamp = iso_timestamp[:-1] + "+00:00"
+    value = datetime.fromisoformat(iso_timestamp)
+    if value.tzinfo is not None:
+        value = value.astimezone().replace(tzinfo=None)
+    return value
+
+
+def _epoch_us(iso_timestamp: str) -> int:
+    """ISO timestamp (naive local or aware) -> integer microseconds since 1970-01-01"""
+    return (_local_naive(iso_timestamp) - _EPOCH) // timedelta(microseconds=1)
+
+
+# Serialized block fields, in to_dict() order
+BLOCK_FIELDS = ("index", "timestamp", "data", "previous_hash", "hash", "nonce")
+
+# Block -> tuple of BLOCK_FIELDS, without building a dict
+block_as_tuple = operator.attrgetter(*BLOCK_FIELDS)
 
 
 class Block:
     """Individual block in the blockchain"""
     
+    # No per-instance __dict__: long chains hold many of these
+    __slots__ = ("index", "timestamp", "data", "previous_hash", "nonce", "hash", "_preimage")
+    
     def __init__(self, index: int, timestamp: str, data: Dict, previous_hash: str):
         self.index = index
         self.timestamp = timestamp
         self.data = data
         self.previous_hash = previous_hash
         self.nonce = 0
+        # (prefix hasher, suffix) around the nonce; see _nonce_preimage
+        self._preimage = None
         self.hash = self.calculate_hash()
     
     def calculate_hash(self) -> str:
         """Calculate SHA-256 hash of block"""
-        block_string = json.dumps({
-            "index": self.index,
-            "timestamp": self.timestamp,
-            "data": self.data,
-            "previous_hash": self.previous_hash,
-            "nonce": self.nonce
-        }, sort_keys=True)
-        return hashlib.sha256(block_string.encode()).hexdigest()
+        # Only the nonce varies once built, so this is a single SHA-256
+        # over cached bytes rather than a fresh serialization
+        prefix_hasher, suffix = self._nonce_preimage()
+        hasher = prefix_hasher.copy()
+        hasher.update(b"%d%s" % (self.nonce, suffix))
+        return hasher.hexdigest()
+    
+    def _nonce_preimage(self):
+        """
+        Split the hash pre-image around the nonce value
+
+        Everything except the nonce is fixed once the block is built, so it
+        is serialized once and cached. Returns a SHA-256 hasher already fed
+        the part before the nonce, plus the encoded part after it.
+        """
+        if self._preimage is None:
+            block_bytes = _canonical_json({
+                "index": self.index,
+                "timestamp": self.timestamp,
+                "data": self.data,
+                "previous_hash": self.previous_hash,
+                "nonce": None
+            })
+            # Sorted keys put "nonce" after "data" and "index"; only strings
+            # (previous_hash, timestamp) follow it, so the last match is ours
+            prefix, marker, suffix = block_bytes.rpartition(b'"nonce":null')
+            self._preimage = (hashlib.sha256(prefix + b'"nonce":'), suffix)
+        return self._preimage
+    
+    @classmethod
+    def from_row(cls, row: Dict) -> "Block":
+        """
+        Rebuild a persisted block (a to_dict()-shaped dict) without mining
+
+        The stored hash is taken as-is; is_chain_valid() re-checks it later.
+        """
+        block = cls.__new__(cls)
+        block.index = row["index"]
+        block.timestamp = row["timestamp"]
+        block.data = row["data"]
+        block.previous_hash = row["previous_hash"]
+        block.nonce = row["nonce"]
+        block._preimage = None
+        block.hash = row["hash"]
+        return block
+    
+    def clear_preimage(self):
+        """Drop the cached pre-image so the next hash re-serializes the fields"""
+        self._preimage = None
     
     def mine_block(self, difficulty: int = 2):
         """Proof of work - mine the block"""
         target = "0" * difficulty
-        while self.hash[:difficulty] != target:
-            self.nonce += 1
-            self.hash = self.calculate_hash()
+        if self.hash[:difficulty] == target:
+            return
+        
+        prefix_hasher, suffix = self._nonce_preimage()
+        start = self.nonce + 1
+        while True:
+            found = _search_nonces(prefix_hasher, suffix, start, MINING_BATCH_SIZE, difficulty)
+            if found:
+                self.nonce, self.hash = found
+                return
+            start += MINING_BATCH_SIZE
     
     def to_dict(self) -> Dict:
         """Convert block to dictionary"""
-        return {
-            "index": self.index,
-            "timestamp": self.timestamp,
-            "data": self.data,
-            "previous_hash": self.previous_hash,
-            "hash": self.hash,
-            "nonce": self.nonce
-        }
+        return dict(zip(BLOCK_FIELDS, block_as_tuple(self)))
 
 
 class BloodUnitBlockchain:
@@ -59,24 +202,77 @@ class BloodUnitBlockchain:
     - Donor → Collection → Testing → Storage → Hospital → Transfusion
     """
     
-    def __init__(self):
+    def __init__(self, store=None, blocks: Optional[List[Block]] = None,
+                 flush_interval_txns: int = FLUSH_INTERVAL_TXNS,
+                 flush_interval_secs: float = FLUSH_INTERVAL_SECS):
         self.chain: List[Block] = []
         self.pending_transactions: List[Dict] = []
         self.difficulty = 2
         
-        # Create genesis block
-        self.create_genesis_block()
+        # One proof-of-work per batch instead of per transaction
+        self.flush_interval_txns = flush_interval_txns
+        self.flush_interval_secs = flush_interval_secs
+        self._last_flush = time.monotonic()
+        
+        # Blocks up to _valid_up_to have been verified; only newer ones are
+        # re-hashed. Code that edits self.chain in place must call
+        # invalidate_validation_cache()
+        self._valid_up_to = -1
+        self._valid = True
+        
+        # unit_id -> [(block_index, tx_index)] and status -> {unit_id},
+        # filled as blocks are appended so lookups skip the chain scan
+        self._unit_index: Dict[str, List[tuple]] = {}
+        self._status_index: Dict[str, set] = defaultdict(set)
+        # Block timestamps as epoch microseconds, parallel to self.chain;
+        # blocks are appended in time order, so it stays sorted for bisect
+        self._ts_index: List[int] = []
+        
+        # Optional persistent store (e.g. DatabaseManager) with add_block(),
+        # get_unit_history(), get_units_by_status() and get_audit_trail();
+        # those lookups then use its indexes instead of scanning the chain
+        self.store = store
+        
+        # Resume an existing chain, or start a new one from a genesis block
+        if blocks:
+            for block in blocks:
+                self._index_block(block)
+        else:
+            self.create_genesis_block()
     
     def create_genesis_block(self):
         """Create the first block in the chain"""
         genesis_block = Block(
             index=0,
-            timestamp=datetime.now().isoformat(),
+            timestamp=_now_iso(),
             data={"type": "genesis", "message": "BloodFlow AI Blockchain Initialized"},
             previous_hash="0"
         )
         genesis_block.mine_block(self.difficulty)
-        self.chain.append(genesis_block)
+        self._append_block(genesis_block)
+    
+    def _index_block(self, block: Block):
+        """Add a block to the chain and the in-memory unit/status indexes"""
+        self.chain.append(block)
+        self._ts_index.append(_epoch_us(block.timestamp))
+        for tx_index, transaction in enumerate(block.data.get("transactions", ())):
+            unit_id = transaction.get("unit_id")
+            if unit_id is not None:
+                self._unit_index.setdefault(unit_id, []).append((block.index, tx_index))
+                self._status_index[transaction.get("status")].add(unit_id)
+    
+    def _append_block(self, block: Block):
+        """
+        Persist a mined block to the store, then add it to the chain
+        
+        The store is what the chain is reloaded from, so a block it failed
+        to save is not appended either; the caller keeps its transactions.
+        """
+        if self.store is not None and not self.store.add_block(block.to_dict()):
+            raise RuntimeError(f"Failed to persist block {block.index}")
+        self._index_block(block)
+        # Validate just the new tail so the cache stays current
+        self.is_chain_valid()
     
     def get_latest_block(self) -> Block:
         """Get the most recent block"""
@@ -99,7 +295,7 @@ class BloodUnitBlockchain:
             "donor_id": donor_id,  # In production, this would be anonymized
             "collection_date": collection_date,
             "location": location,
-            "timestamp": datetime.now().isoformat(),
+            "timestamp": _now_iso(),
             "status": "collected"
         }
         
@@ -107,23 +303,38 @@ class BloodUnitBlockchain:
         return unit_id
     
     def add_transaction(self, transaction: Dict):
-        """Add a transaction to pending transactions"""
+        """Add a transaction to pending transactions, mining once a batch is due"""
         self.pending_transactions.append(transaction)
+        if (len(self.pending_transactions) >= self.flush_interval_txns
+                or time.monotonic() - self._last_flush > self.flush_interval_secs):
+            self.flush()
+    
+    def flush(self):
+        """
+        Mine pending transactions now, for callers that need them on-chain
+        
+        Query and export methods call this first, so they always see every
+        added transaction. The time threshold in add_transaction is only
+        checked on the next add, so writers that must persist immediately
+        (e.g. single API requests) should call flush() themselves.
+        """
+        return self.mine_pending_transactions()
     
     def mine_pending_transactions(self):
         """Mine all pending transactions into a new block"""
+        self._last_flush = time.monotonic()
         if not self.pending_transactions:
             return None
         
         new_block = Block(
             index=len(self.chain),
-            timestamp=datetime.now().isoformat(),
+            timestamp=_now_iso(),
             data={"transactions": self.pending_transactions},
             previous_hash=self.get_latest_block().hash
         )
         
         new_block.mine_block(self.difficulty)
-        self.chain.append(new_block)
+        self._append_block(new_block)
         
         # Clear pending transactions
         self.pending_transactions = []
@@ -137,11 +348,10 @@ class BloodUnitBlockchain:
             "unit_id": unit_id,
             "test_results": test_results,
             "tested_by": test_results.get("technician_id", "LAB-001"),
-            "timestamp": datetime.now().isoformat(),
+            "timestamp": _now_iso(),
             "status": "tested" if test_results.get("passed", True) else "rejected"
         }
         self.add_transaction(transaction)
-        self.mine_pending_transactions()
     
     def add_storage_record(self, unit_id: str, storage_location: str, 
                           temperature: float, expiry_date: str):
@@ -152,11 +362,10 @@ class BloodUnitBlockchain:
             "storage_location": storage_location,
             "temperature": temperature,
             "expiry_date": expiry_date,
-            "timestamp": datetime.now().isoformat(),
+            "timestamp": _now_iso(),
             "status": "stored"
         }
         self.add_transaction(transaction)
-        self.mine_pending_transactions()
     
     def add_transfer_record(self, unit_id: str, from_location: str, 
                            to_location: str, transported_by: str):
@@ -167,11 +376,10 @@ class BloodUnitBlockchain:
             "from_location": from_location,
             "to_location": to_location,
             "transported_by": transported_by,
-            "timestamp": datetime.now().isoformat(),
+            "timestamp": _now_iso(),
             "status": "in_transit"
         }
         self.add_transaction(transaction)
-        self.mine_pending_transactions()
     
     def add_transfusion_record(self, unit_id: str, hospital: str, 
                               patient_id: str, doctor_id: str):
@@ -180,13 +388,16 @@ class BloodUnitBlockchain:
             "type": "TRANSFUSION",
             "unit_id": unit_id,
             "hospital": hospital,
-            "patient_id_hash": hashlib.sha256(patient_id.encode()).hexdigest()[:16],  # Anonymized
+            "patient_id_hash": hashlib.blake2b(
+                patient_id.encode(), digest_size=8, key=PATIENT_HASH_KEY
+            ).hexdigest(),  # Anonymized, 16 hex chars
             "doctor_id": doctor_id,
-            "timestamp": datetime.now().isoformat(),
+            "timestamp": _now_iso(),
             "status": "transfused"
         }
         self.add_transaction(transaction)
-        self.mine_pending_transactions()
+        # End of the unit's lifecycle: commit it immediately
+        self.flush()
     
     def get_unit_history(self, unit_id: str) -> List[Dict]:
         """
@@ -194,17 +405,19 @@ class BloodUnitBlockchain:
         
         Returns all transactions related to this unit
         """
+        self.flush()
+        if self.store is not None:
+            return self.store.get_unit_history(unit_id)
+        
         history = []
         
-        for block in self.chain:
-            if "transactions" in block.data:
-                for transaction in block.data["transactions"]:
-                    if transaction.get("unit_id") == unit_id:
-                        history.append({
-                            "block_index": block.index,
-                            "block_hash": block.hash,
-                            "transaction": transaction
-                        })
+        for block_index, tx_index in self._unit_index.get(unit_id, ()):
+            block = self.chain[block_index]
+            history.append({
+                "block_index": block.index,
+                "block_hash": block.hash,
+                "transaction": block.data["transactions"][tx_index]
+            })
         
         return history
     
@@ -236,23 +449,38 @@ class BloodUnitBlockchain:
         }
     
     def is_chain_valid(self) -> bool:
-        """Validate the entire blockchain"""
-        for i in range(1, len(self.chain)):
+        """Validate the blockchain, re-checking only blocks not yet verified"""
+        if not self._valid:
+            return False
+        
+        for i in range(max(self._valid_up_to + 1, 1), len(self.chain)):
             current_block = self.chain[i]
             previous_block = self.chain[i - 1]
             
             # Verify hash is correct
             if current_block.hash != current_block.calculate_hash():
+                self._valid = False
                 return False
             
             # Verify chain linkage
             if current_block.previous_hash != previous_block.hash:
+                self._valid = False
                 return False
+            
+            self._valid_up_to = i
         
         return True
     
+    def invalidate_validation_cache(self):
+        """Force the next is_chain_valid() to re-serialize and re-verify every block"""
+        self._valid_up_to = -1
+        self._valid = True
+        for block in self.chain:
+            block.clear_preimage()
+    
     def get_chain_info(self) -> Dict:
         """Get blockchain statistics"""
+        self.flush()
         total_transactions = sum(
             len(block.data.get("transactions", [])) 
             for block in self.chain
@@ -266,45 +494,82 @@ class BloodUnitBlockchain:
             "difficulty": self.difficulty
         }
     
-    def export_chain(self) -> List[Dict]:
+    def export_chain_list(self) -> List[Dict]:
         """Export entire blockchain for audit"""
+        self.flush()
         return [block.to_dict() for block in self.chain]
     
+    # Backward-compatible name
+    export_chain = export_chain_list
+    
+    def iter_blocks(self):
+        """Yield blocks as dicts one at a time, without building the full list"""
+        self.flush()
+        for block in self.chain:
+            yield block.to_dict()
+    
+    def dump_ndjson(self, fp):
+        """Write the chain to a binary file object, one JSON block per line"""
+        self.flush()
+        for block in self.chain:
+            fp.write(_canonical_json(block.to_dict()))
+            fp.write(b"\n")
+    
+    def export_chain_rows(self) -> List[tuple]:
+        """Export the blockchain as BLOCK_FIELDS-ordered tuples (no per-block dicts)"""
+        self.flush()
+        return list(map(block_as_tuple, self.chain))
+    
     def get_units_by_status(self, status: str) -> List[str]:
         """Get all blood units with a specific status"""
-        units = set()
-        
-        for block in self.chain:
-            if "transactions" in block.data:
-                for transaction in block.data["transactions"]:
-                    if transaction.get("status") == status:
-                        units.add(transaction.get("unit_id"))
+        self.flush()
+        if self.store is not None:
+            return self.store.get_units_by_status(status)
         
-        return list(units)
+        return list(self._status_index.get(status, ()))
     
     def get_audit_trail(self, start_date: str, end_date: str) -> List[Dict]:
         """
         Get audit trail for a date range
         For regulatory compliance
         """
+        self.flush()
+        # Block timestamps are naive local time; bring aware bounds in line
+        start_date = _local_naive(start_date).isoformat()
+        end_date = _local_naive(end_date).isoformat()
+        if self.store is not None:
+            return self.store.get_audit_trail(start_date, end_date)
+        
         audit_records = []
         
-        for block in self.chain:
-            block_time = block.timestamp
-            if start_date <= block_time <= end_date:
-                if "transactions" in block.data:
-                    for transaction in block.data["transactions"]:
-                        audit_records.append({
-                            "block": block.index,
-                            "timestamp": transaction.get("timestamp"),
-                            "type": transaction.get("type"),
-                            "unit_id": transaction.get("unit_id"),
-                            "status": transaction.get("status"),
-                            "block_hash": block.hash
-                        })
+        # Integer bisect brackets exactly the blocks inside the window
+        lo = bisect_left(self._ts_index, _epoch_us(start_date))
+        hi = bisect_right(self._ts_index, _epoch_us(end_date))
+        for block in self.chain[lo:hi]:
+            if "transactions" in block.data:
+                for transaction in block.data["transactions"]:
+                    audit_records.append({
+                        "block": block.index,
+                        "timestamp": transaction.get("timestamp"),
+                        "type": transaction.get("type"),
+                        "unit_id": transaction.get("unit_id"),
+                        "status": transaction.get("status"),
+                        "block_hash": block.hash
+                    })
         
         return audit_records
 
 
-# Global blockchain instance
-blood_blockchain = BloodUnitBlockchain()
+@functools.lru_cache(maxsize=None)
+def get_blockchain() -> BloodUnitBlockchain:
+    """
+    Shared blockchain, created on first use
+
+    Backed by the database: persisted blocks are reloaded with their
+    stored hashes (no proof-of-work), and new blocks are written through.
+    """
+    from database.db_manager import get_db_manager
+    
+    store = get_db_manager()
+    blocks = [Block.from_row(row) for row in store.get_blocks()]
+    return BloodUnitBlockchain(store=store, blocks=blocks)
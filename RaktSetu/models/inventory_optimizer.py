@@ -5,8 +5,7 @@ Smart recommendations for blood stock management
 
 import numpy as np
 from datetime import datetime, timedelta
-from typing import List, Dict
-import random
+from typing import List, Dict, Optional
 
 
 class InventoryOptimizer:
@@ -59,9 +58,60 @@ class InventoryOptimizer:
             "AB-": 15
         }
         
+        # Baseline 7-day demand
+        self.base_weekly_demand = {
+            "O+": 280,
+            "A+": 245,
+            "B+": 175,
+            "O-": 105,
+            "A-": 84,
+            "AB+": 70,
+            "B-": 56,
+            "AB-": 35
+        }
+        
         # Blood shelf life (days)
         self.shelf_life = 35
         
+        # Same levels as parallel arrays indexed via bt_index, for batched status
+        self.bt_index = {bt: i for i, bt in enumerate(self.blood_types)}
+        self._current = np.array([self.current_inventory[bt] for bt in self.blood_types], dtype=np.int32)
+        self._safety = np.array([self.safety_stock[bt] for bt in self.blood_types], dtype=np.int32)
+        self._optimal = np.array([self.optimal_stock[bt] for bt in self.blood_types], dtype=np.int32)
+        self._base_demand = np.array([self.base_weekly_demand[bt] for bt in self.blood_types], dtype=np.int32)
+        
+        self._rng = np.random.default_rng()
+        
+        # Pre-drawn demand variations for _estimate_weekly_demand
+        self._variations = []
+        self._variation_pos = 0
+        
+        # Urgency labels by tier: below half safety, below safety, below 70% optimal, else
+        self._urgency_labels = np.array(["critical", "high", "medium", "low"])
+        
+        # Stock recommendations by tier (see _recommendation_tiers)
+        self._rec_templates = [
+            "🚨 URGENT: Stock {units_needed} units of {blood_type} immediately. "
+            "Current stock below safety level.",
+            "⚠️ RECOMMEND: Stock {units_needed} units of {blood_type} soon. "
+            "Predicted demand: {predicted_demand} units/week.",
+            "📊 OPTIMIZE: Consider redistributing excess {blood_type} stock "
+            "to other locations or prioritize usage to prevent wastage.",
+            "✅ GOOD: {blood_type} stock levels are optimal."
+        ]
+        
+        # Expiry tiers: <=2 days, <=5 days, later
+        self._expiry_day_bounds = np.array([2, 5])
+        self._expiry_urgency = np.array(["critical", "high", "medium"])
+        self._expiry_templates = [
+            "🚨 URGENT: {units} units of {blood_type} expiring in {days} day(s). "
+            "Contact high-demand hospitals immediately or mark for platelet extraction.",
+            "⚠️ PRIORITY: {units} units of {blood_type} expiring in {days} days. "
+            "Prioritize for scheduled surgeries or transfer to high-use facility.",
+            "📋 PLAN: {units} units of {blood_type} expiring in {days} days. "
+            "Monitor usage patterns and consider redistribution if needed."
+        ]
+        
     def get_inventory_status(self, blood_type: str) -> Dict:
         """
         Get comprehensive inventory status with AI recommendations
@@ -69,80 +119,82 @@ class InventoryOptimizer:
         Returns:
             Status dict with current stock, predictions, and recommendations
         """
-        current = self.current_inventory.get(blood_type, 0)
-        safety = self.safety_stock.get(blood_type, 0)
-        optimal = self.optimal_stock.get(blood_type, 0)
+        return self.get_all_statuses([blood_type])[0]
+    
+    def get_all_statuses(self, blood_types: Optional[List[str]] = None) -> List[Dict]:
+        """
+        Inventory status for several blood types in one vectorized pass
+        
+        Args:
+            blood_types: Blood types to report, in order (default: all)
+        
+        Returns:
+            One status dict per blood type, as get_inventory_status
+        """
+        if blood_types is None:
+            blood_types = self.blood_types
+        idx = np.array([self.bt_index[bt] for bt in blood_types], dtype=np.intp)
+        
+        current = self._current[idx]
+        safety = self._safety[idx]
+        optimal = self._optimal[idx]
         
         # Calculate predicted demand (simplified - in production use the predictor)
-        predicted_demand_7days = self._estimate_weekly_demand(blood_type)
+        predicted_demand_7days = (
+            self._base_demand[idx] * self._rng.uniform(0.9, 1.1, len(idx))
+        ).astype(int)
         
         # Calculate days until shortage
         daily_demand = predicted_demand_7days / 7
-        days_until_shortage = int(current / daily_demand) if daily_demand > 0 else None
-        
-        # Determine urgency level
-        if current < safety * 0.5:
-            urgency = "critical"
-        elif current < safety:
-            urgency = "high"
-        elif current < optimal * 0.7:
-            urgency = "medium"
-        else:
-            urgency = "low"
+        has_demand = daily_demand > 0
+        days_left = np.divide(current, daily_demand, out=np.zeros(len(idx)), where=has_demand).astype(int)
         
-        # Generate recommendation
-        recommendation = self._generate_recommendation(
-            blood_type, current, safety, optimal, predicted_demand_7days
-        )
+        # Determine urgency level and recommendation as tier indexes
+        urgency = self._urgency_labels[np.select(
+            [current < safety * 0.5, current < safety, current < optimal * 0.7], [0, 1, 2], default=3
+        )]
+        rec_tiers = self._recommendation_tiers(current, safety, optimal)
         
-        return {
-            "blood_type": blood_type,
-            "current_stock": current,
-            "safety_stock": safety,
-            "optimal_stock": optimal,
-            "predicted_demand": predicted_demand_7days,
-            "days_until_shortage": days_until_shortage,
-            "recommendation": recommendation,
-            "urgency_level": urgency,
-            "stock_percentage": round((current / optimal) * 100, 1)
-        }
+        statuses = []
+        for blood_type, cur, safe, opt, demand, days, has, level, tier, ratio in zip(
+            blood_types, current.tolist(), safety.tolist(), optimal.tolist(),
+            predicted_demand_7days.tolist(), days_left.tolist(), has_demand.tolist(),
+            urgency.tolist(), rec_tiers.tolist(), (current / optimal).tolist()
+        ):
+            statuses.append({
+                "blood_type": blood_type,
+                "current_stock": cur,
+                "safety_stock": safe,
+                "optimal_stock": opt,
+                "predicted_demand": demand,
+                "days_until_shortage": days if has else None,
+                "recommendation": self._rec_templates[tier].format(
+                    blood_type=blood_type, units_needed=opt - cur, predicted_demand=demand
+                ),
+                "urgency_level": level,
+                "stock_percentage": round(ratio * 100, 1)
+            })
+        
+        return statuses
     
     def _estimate_weekly_demand(self, blood_type: str) -> int:
         """Estimate 7-day demand (simplified version)"""
-        base_demands = {
-            "O+": 280,
-            "A+": 245,
-            "B+": 175,
-            "O-": 105,
-            "A-": 84,
-            "AB+": 70,
-            "B-": 56,
-            "AB-": 35
-        }
-        
-        base = base_demands.get(blood_type, 100)
-        variation = random.uniform(0.9, 1.1)
-        return int(base * variation)
+        base = self.base_weekly_demand.get(blood_type, 100)
+        return int(base * self._next_variation())
     
-    def _generate_recommendation(self, blood_type: str, current: int, 
-                                  safety: int, optimal: int, predicted_demand: int) -> str:
-        """Generate actionable recommendation"""
-        if current < safety:
-            units_needed = optimal - current
-            return (f"🚨 URGENT: Stock {units_needed} units of {blood_type} immediately. "
-                   f"Current stock below safety level.")
-        
-        elif current < optimal * 0.7:
-            units_needed = optimal - current
-            return (f"⚠️ RECOMMEND: Stock {units_needed} units of {blood_type} soon. "
-                   f"Predicted demand: {predicted_demand} units/week.")
-        
-        elif current > optimal * 1.3:
-            return (f"📊 OPTIMIZE: Consider redistributing excess {blood_type} stock "
-                   f"to other locations or prioritize usage to prevent wastage.")
-        
-        else:
-            return f"✅ GOOD: {blood_type} stock levels are optimal."
+    def _next_variation(self) -> float:
+        """Next +/-10% demand variation, served from a pre-drawn batch"""
+        if self._variation_pos >= len(self._variations):
+            self._variations = self._rng.uniform(0.9, 1.1, 256).tolist()
+            self._variation_pos = 0
+        self._variation_pos += 1
+        return self._variations[self._variation_pos - 1]
+    
+    def _recommendation_tiers(self, current, safety, optimal) -> np.ndarray:
+        """Recommendation tier: below safety, below 70% optimal, above 130% optimal, else"""
+        return np.select(
+            [current < safety, current < optimal * 0.7, current > optimal * 1.3], [0, 1, 2], default=3
+        )
     
     def calculate_overall_health(self, statuses: List[Dict]) -> str:
         """Calculate overall inventory health score"""
@@ -164,8 +216,6 @@ class InventoryOptimizer:
         
         Simulates multi-location optimization
         """
-        suggestions = []
-        
         # Simulated other locations inventory
         locations = {
             "Main Blood Bank": self.current_inventory,
@@ -178,53 +228,61 @@ class InventoryOptimizer:
                 "A-": 10, "AB+": 22, "B-": 18, "AB-": 5
             }
         }
+        names = list(locations)
         
-        for blood_type in self.blood_types:
-            # Find locations with excess and shortage
-            excess_locations = []
-            shortage_locations = []
-            
-            for location, inventory in locations.items():
-                current = inventory.get(blood_type, 0)
-                optimal = self.optimal_stock.get(blood_type, 0)
-                safety = self.safety_stock.get(blood_type, 0)
-                
-                if current > optimal * 1.2:
-                    excess_locations.append({
-                        "location": location,
-                        "excess": current - optimal
-                    })
-                elif current < safety:
-                    shortage_locations.append({
-                        "location": location,
-                        "shortage": safety - current
-                    })
+        # (locations x blood types) stock, columns aligned with self.blood_types
+        inv = np.array([
+            [inventory.get(bt, 0) for bt in self.blood_types] for inventory in locations.values()
+        ])
+        
+        # Excess above 120% of optimal (transferable down to optimal) and
+        # shortage below safety, for every location/type at once
+        excess = np.where(inv > self._optimal * 1.2, inv - self._optimal, 0)
+        shortage = np.where(inv < self._safety, self._safety - inv, 0)
+        
+        blood_type_col, from_idx, to_idx, units, high_priority = [], [], [], [], []
+        
+        for j, blood_type in enumerate(self.blood_types):
+            donors = np.flatnonzero(excess[:, j])
+            receivers = np.flatnonzero(shortage[:, j])
+            if not len(donors) or not len(receivers):
+                continue
             
-            # Generate transfer suggestions
-            for shortage in shortage_locations:
-                for excess in excess_locations:
-                    if excess["excess"] > 0:
-                        transfer_amount = min(shortage["shortage"], excess["excess"])
+            # Greedy pairing in location order, only over the non-zero cells
+            available = excess[donors, j].tolist()
+            safety = int(self._safety[j])
+            for r in receivers.tolist():
+                needed = int(shortage[r, j])
+                for k, d in enumerate(donors.tolist()):
+                    if available[k] > 0:
+                        transfer_amount = min(needed, available[k])
                         
                         if transfer_amount >= 5:  # Only suggest if meaningful
-                            suggestions.append({
-                                "blood_type": blood_type,
-                                "from_location": excess["location"],
-                                "to_location": shortage["location"],
-                                "units": transfer_amount,
-                                "priority": "high" if shortage["shortage"] > safety * 0.5 else "medium",
-                                "reason": f"Balance stock levels - {shortage['location']} below safety threshold"
-                            })
+                            blood_type_col.append(blood_type)
+                            from_idx.append(d)
+                            to_idx.append(r)
+                            units.append(transfer_amount)
+                            high_priority.append(needed > safety * 0.5)
                             
                             # Update for next iteration
-                            excess["excess"] -= transfer_amount
-                            shortage["shortage"] -= transfer_amount
+                            available[k] -= transfer_amount
+                            needed -= transfer_amount
         
-        # Sort by priority
-        priority_order = {"high": 0, "medium": 1, "low": 2}
-        suggestions.sort(key=lambda x: (priority_order[x["priority"]], -x["units"]))
+        # Sort by priority (high first), then by units descending; lexsort is
+        # stable, so ties keep generation order
+        order = np.lexsort((-np.array(units, dtype=int), ~np.array(high_priority, dtype=bool)))
         
-        return suggestions
+        return [
+            {
+                "blood_type": blood_type_col[i],
+                "from_location": names[from_idx[i]],
+                "to_location": names[to_idx[i]],
+                "units": units[i],
+                "priority": "high" if high_priority[i] else "medium",
+                "reason": f"Balance stock levels - {names[to_idx[i]]} below safety threshold"
+            }
+            for i in order.tolist()
+        ]
     
     def calculate_waste_reduction(self, suggestions: List[Dict]) -> Dict:
         """Calculate potential waste reduction from redistribution"""
@@ -248,38 +306,35 @@ class InventoryOptimizer:
         
         Simulates expiry tracking
         """
+        n = len(self.blood_types)
+        
+        # Simulated expiry data: one draw per column for all blood types
+        nearing_expiry = self._rng.random(n) > 0.6
+        units_expiring = self._rng.integers(3, 16, n)
+        days_until_expiry = self._rng.integers(1, 8, n)
+        
+        tiers = np.searchsorted(self._expiry_day_bounds, days_until_expiry)
+        
+        # Soonest expiry first; stable, so ties keep blood type order
+        idx = np.flatnonzero(nearing_expiry)
+        idx = idx[np.argsort(days_until_expiry[idx], kind="stable")]
+        
         alerts = []
+        for i, units, days, tier in zip(
+            idx.tolist(), units_expiring[idx].tolist(), days_until_expiry[idx].tolist(), tiers[idx].tolist()
+        ):
+            blood_type = self.blood_types[i]
+            alerts.append({
+                "blood_type": blood_type,
+                "units": units,
+                "days_until_expiry": days,
+                "urgency": str(self._expiry_urgency[tier]),
+                "recommendation": self._expiry_templates[tier].format(
+                    blood_type=blood_type, units=units, days=days
+                )
+            })
         
-        # Simulated expiry data
-        for blood_type in self.blood_types:
-            # Random units nearing expiry
-            if random.random() > 0.6:
-                units_expiring = random.randint(3, 15)
-                days_until_expiry = random.randint(1, 7)
-                
-                urgency = "critical" if days_until_expiry <= 2 else "high" if days_until_expiry <= 5 else "medium"
-                
-                alerts.append({
-                    "blood_type": blood_type,
-                    "units": units_expiring,
-                    "days_until_expiry": days_until_expiry,
-                    "urgency": urgency,
-                    "recommendation": self._get_expiry_recommendation(blood_type, units_expiring, days_until_expiry)
-                })
-        
-        return sorted(alerts, key=lambda x: x["days_until_expiry"])
-    
-    def _get_expiry_recommendation(self, blood_type: str, units: int, days: int) -> str:
-        """Generate recommendation for expiring blood"""
-        if days <= 2:
-            return (f"🚨 URGENT: {units} units of {blood_type} expiring in {days} day(s). "
-                   f"Contact high-demand hospitals immediately or mark for platelet extraction.")
-        elif days <= 5:
-            return (f"⚠️ PRIORITY: {units} units of {blood_type} expiring in {days} days. "
-                   f"Prioritize for scheduled surgeries or transfer to high-use facility.")
-        else:
-            return (f"📋 PLAN: {units} units of {blood_type} expiring in {days} days. "
-                   f"Monitor usage patterns and consider redistribution if needed.")
+        return alerts
     
     def optimize_collection_schedule(self, blood_type: str) -> Dict:
         """
@@ -5,7 +5,9 @@ Context-aware, personalized notifications for donors and staff
 
 from datetime import datetime, timedelta
 from typing import List, Dict, Optional
+from collections import Counter, defaultdict, deque
 from enum import Enum
+import time
 
 
 class NotificationType(Enum):
@@ -36,6 +38,43 @@ class NotificationPriority(Enum):
     LOW = "low"
 
 
+# Enum values used on the notification hot paths, resolved once
+# (Enum .value goes through descriptor lookups on every access)
+_TYPE_URGENCY = NotificationType.URGENCY.value
+_TYPE_PERSONALIZED = NotificationType.PERSONALIZED.value
+_TYPE_LOCATION_AWARE = NotificationType.LOCATION_AWARE.value
+_TYPE_EVENT_TRIGGERED = NotificationType.EVENT_TRIGGERED.value
+_TYPE_APPOINTMENT_REMINDER = NotificationType.APPOINTMENT_REMINDER.value
+_TYPE_THANK_YOU = NotificationType.THANK_YOU.value
+_TYPE_MILESTONE = NotificationType.MILESTONE.value
+
+_PRIORITY_CRITICAL = NotificationPriority.CRITICAL.value
+_PRIORITY_HIGH = NotificationPriority.HIGH.value
+_PRIORITY_MEDIUM = NotificationPriority.MEDIUM.value
+_PRIORITY_LOW = NotificationPriority.LOW.value
+
+_SMS = NotificationChannel.SMS.value
+_EMAIL = NotificationChannel.EMAIL.value
+_APP_PUSH = NotificationChannel.APP_PUSH.value
+_VOICE_CALL = NotificationChannel.VOICE_CALL.value
+
+# Channel sets shared by every notification of a kind (immutable, so safe to share)
+_CHANNELS_SMS_PUSH = (_SMS, _APP_PUSH)
+_CHANNELS_PUSH_SMS = (_APP_PUSH, _SMS)
+_CHANNELS_EMAIL_PUSH = (_EMAIL, _APP_PUSH)
+_CHANNELS_SMS_EMAIL = (_SMS, _EMAIL)
+_CHANNELS_EMERGENCY = (_SMS, _APP_PUSH, _VOICE_CALL)
+
+# Validity window of urgency notifications
+_TD_72H = timedelta(hours=72)
+
+
+def _now_iso_and_exp72():
+    """created_at and expires_at (+72h) ISO strings from a single now()"""
+    now = datetime.now()
+    return now.isoformat(), (now + _TD_72H).isoformat()
+
+
 class SmartNotificationSystem:
     """
     Intelligent notification system
@@ -52,6 +91,15 @@ class SmartNotificationSystem:
         self.notification_history = []
         self.spam_protection_hours = 24  # Don't contact same donor within 24h
         self.max_notifications_per_week = 3
+        
+        # Send times (epoch seconds, oldest first) per donor, pruned to the
+        # last week on access, so spam checks don't scan the whole history
+        self._per_donor: Dict[str, deque] = defaultdict(deque)
+        
+        # Running analytics counts, updated on every send
+        self._by_type = Counter()
+        self._by_priority = Counter()
+        self._by_channel = Counter()
     
     def create_urgency_notification(self, blood_type: str, units_needed: int,
                                    location: str, urgency: str) -> Dict:
@@ -69,20 +117,33 @@ class SmartNotificationSystem:
             "low": f"📋 REMINDER: {blood_type} donations welcome. Current need: {units_needed} units."
         }
         
+        created_at, expires_at = _now_iso_and_exp72()
+        
         return {
-            "type": NotificationType.URGENCY.value,
+            "type": _TYPE_URGENCY,
             "priority": urgency,
             "blood_type": blood_type,
             "subject": f"{urgency.upper()}: {blood_type} Blood Needed",
             "message": urgency_messages.get(urgency.lower(), urgency_messages["medium"]),
             "units_needed": units_needed,
             "location": location,
-            "created_at": datetime.now().isoformat(),
-            "expires_at": (datetime.now() + timedelta(hours=72)).isoformat(),
+            "created_at": created_at,
+            "expires_at": expires_at,
             "call_to_action": "Donate Now",
-            "channels": [NotificationChannel.SMS.value, NotificationChannel.APP_PUSH.value]
+            "channels": _CHANNELS_SMS_PUSH
         }
     
+    def create_urgency_batch(self, donor_ids: List[str], blood_type: str, units_needed: int,
+                             location: str, urgency: str) -> List[Dict]:
+        """
+        Urgency notifications addressed to many donors at once
+        
+        Message, subject and timestamps are built a single time and shared
+        by every row (all immutable); only donor_id differs per notification.
+        """
+        template = self.create_urgency_notification(blood_type, units_needed, location, urgency)
+        return [{**template, "donor_id": donor_id} for donor_id in donor_ids]
+    
     def create_personalized_notification(self, donor_id: str, donor_name: str,
                                         blood_type: str, last_donation_days: int) -> Dict:
         """
@@ -110,8 +171,8 @@ class SmartNotificationSystem:
             message = f"Your {blood_type} blood is valuable. Schedule your next donation today!"
         
         return {
-            "type": NotificationType.PERSONALIZED.value,
-            "priority": NotificationPriority.MEDIUM.value,
+            "type": _TYPE_PERSONALIZED,
+            "priority": _PRIORITY_MEDIUM,
             "donor_id": donor_id,
             "subject": "Time to Donate Again?",
             "message": message,
@@ -123,7 +184,7 @@ class SmartNotificationSystem:
             },
             "created_at": datetime.now().isoformat(),
             "call_to_action": "Book Appointment",
-            "channels": [NotificationChannel.EMAIL.value, NotificationChannel.APP_PUSH.value]
+            "channels": _CHANNELS_EMAIL_PUSH
         }
     
     def create_location_aware_notification(self, donor_location: str, 
@@ -142,8 +203,8 @@ class SmartNotificationSystem:
                   f"Donate at a location near you this week!")
         
         return {
-            "type": NotificationType.LOCATION_AWARE.value,
-            "priority": NotificationPriority.MEDIUM.value,
+            "type": _TYPE_LOCATION_AWARE,
+            "priority": _PRIORITY_MEDIUM,
             "subject": f"Blood Needed Near You - {donor_location}",
             "message": message,
             "blood_type": blood_type,
@@ -154,7 +215,7 @@ class SmartNotificationSystem:
             },
             "created_at": datetime.now().isoformat(),
             "call_to_action": "Find Nearest Center",
-            "channels": [NotificationChannel.APP_PUSH.value, NotificationChannel.SMS.value]
+            "channels": _CHANNELS_PUSH_SMS
         }
     
     def create_event_notification(self, event_type: str, blood_types_needed: List[str],
@@ -176,8 +237,8 @@ class SmartNotificationSystem:
         message = event_messages.get(event_type, event_messages["accident"])
         
         return {
-            "type": NotificationType.EVENT_TRIGGERED.value,
-            "priority": NotificationPriority.CRITICAL.value if event_type in ["accident", "disaster"] else NotificationPriority.HIGH.value,
+            "type": _TYPE_EVENT_TRIGGERED,
+            "priority": _PRIORITY_CRITICAL if event_type in ["accident", "disaster"] else _PRIORITY_HIGH,
             "event_type": event_type,
             "subject": f"URGENT: {event_type.title()} - Blood Needed",
             "message": message,
@@ -185,7 +246,7 @@ class SmartNotificationSystem:
             "impact": impact_description,
             "created_at": datetime.now().isoformat(),
             "call_to_action": "Emergency Donate",
-            "channels": [NotificationChannel.SMS.value, NotificationChannel.APP_PUSH.value, NotificationChannel.VOICE_CALL.value]
+            "channels": _CHANNELS_EMERGENCY
         }
     
     def create_appointment_reminder(self, donor_name: str, appointment_date: str,
@@ -199,8 +260,8 @@ class SmartNotificationSystem:
                   f"tomorrow at {appointment_time} at {location}. See you there!")
         
         return {
-            "type": NotificationType.APPOINTMENT_REMINDER.value,
-            "priority": NotificationPriority.MEDIUM.value,
+            "type": _TYPE_APPOINTMENT_REMINDER,
+            "priority": _PRIORITY_MEDIUM,
             "subject": "Donation Appointment Reminder",
             "message": message,
             "appointment_info": {
@@ -210,7 +271,7 @@ class SmartNotificationSystem:
             },
             "created_at": datetime.now().isoformat(),
             "call_to_action": "Confirm Appointment",
-            "channels": [NotificationChannel.SMS.value, NotificationChannel.EMAIL.value]
+            "channels": _CHANNELS_SMS_EMAIL
         }
     
     def create_thank_you_notification(self, donor_name: str, blood_type: str,
@@ -224,8 +285,8 @@ class SmartNotificationSystem:
                   f"can help save up to {lives_impacted} lives. You're a hero! ❤️")
         
         return {
-            "type": NotificationType.THANK_YOU.value,
-            "priority": NotificationPriority.LOW.value,
+            "type": _TYPE_THANK_YOU,
+            "priority": _PRIORITY_LOW,
             "subject": "Thank You for Saving Lives!",
             "message": message,
             "donation_info": {
@@ -235,7 +296,7 @@ class SmartNotificationSystem:
             },
             "created_at": datetime.now().isoformat(),
             "call_to_action": "Share Your Impact",
-            "channels": [NotificationChannel.EMAIL.value, NotificationChannel.APP_PUSH.value]
+            "channels": _CHANNELS_EMAIL_PUSH
         }
     
     def create_milestone_notification(self, donor_name: str, total_donations: int,
@@ -257,8 +318,8 @@ class SmartNotificationSystem:
             f"🎊 {donor_name}, you've completed {total_donations} donations! Thank you for your commitment!")
         
         return {
-            "type": NotificationType.MILESTONE.value,
-            "priority": NotificationPriority.LOW.value,
+            "type": _TYPE_MILESTONE,
+            "priority": _PRIORITY_LOW,
             "subject": f"Milestone Achieved: {total_donations} Donations!",
             "message": message,
             "milestone_info": {
@@ -268,7 +329,7 @@ class SmartNotificationSystem:
             },
             "created_at": datetime.now().isoformat(),
             "call_to_action": "Share Your Achievement",
-            "channels": [NotificationChannel.EMAIL.value, NotificationChannel.APP_PUSH.value]
+            "channels": _CHANNELS_EMAIL_PUSH
         }
     
     def check_spam_protection(self, donor_id: str, notification_type: str) -> bool:
@@ -277,29 +338,25 @@ class SmartNotificationSystem:
         
         Returns True if OK to send, False if would be spam
         """
-        # Get recent notifications to this donor
-        recent = [n for n in self.notification_history 
-                 if n.get("donor_id") == donor_id]
+        sent_times = self._per_donor.get(donor_id)
         
-        if not recent:
+        if not sent_times:
             return True  # No history, OK to send
         
-        # Check 24-hour rule
-        last_notification = max(recent, key=lambda x: x.get("created_at", ""))
-        last_time = datetime.fromisoformat(last_notification.get("created_at", datetime.now().isoformat()))
+        # Forget sends older than a week
+        now = time.time()
+        while sent_times and now - sent_times[0] >= 7 * 86400:
+            sent_times.popleft()
         
-        if (datetime.now() - last_time).total_seconds() < self.spam_protection_hours * 3600:
+        # Check 24-hour rule
+        if sent_times and now - sent_times[-1] < self.spam_protection_hours * 3600:
             # Exception for critical notifications
-            if notification_type == NotificationType.URGENCY.value:
+            if notification_type == _TYPE_URGENCY:
                 return True
             return False
         
         # Check weekly limit
-        week_ago = datetime.now() - timedelta(days=7)
-        recent_week = [n for n in recent 
-                      if datetime.fromisoformat(n.get("created_at", "")) > week_ago]
-        
-        if len(recent_week) >= self.max_notifications_per_week:
+        if len(sent_times) >= self.max_notifications_per_week:
             return False
         
         return True
@@ -312,6 +369,11 @@ class SmartNotificationSystem:
         """
         # Add to history
         self.notification_history.append(notification)
+        if notification.get("donor_id") is not None:
+            self._per_donor[notification["donor_id"]].append(time.time())
+        self._by_type[notification.get("type", "unknown")] += 1
+        self._by_priority[notification.get("priority", "unknown")] += 1
+        self._by_channel.update(notification.get("channels", []))
         
         # Simulate sending
         return {
@@ -329,24 +391,10 @@ class SmartNotificationSystem:
         if total == 0:
             return {"total_sent": 0, "message": "No notifications sent yet"}
         
-        by_type = {}
-        by_priority = {}
-        by_channel = {}
-        
-        for notif in self.notification_history:
-            notif_type = notif.get("type", "unknown")
-            priority = notif.get("priority", "unknown")
-            
-            by_type[notif_type] = by_type.get(notif_type, 0) + 1
-            by_priority[priority] = by_priority.get(priority, 0) + 1
-            
-            for channel in notif.get("channels", []):
-                by_channel[channel] = by_channel.get(channel, 0) + 1
-        
         return {
             "total_sent": total,
-            "by_type": by_type,
-            "by_priority": by_priority,
-            "by_channel": by_channel,
+            "by_type": dict(self._by_type),
+            "by_priority": dict(self._by_priority),
+            "by_channel": dict(self._by_channel),
             "average_per_day": round(total / max((datetime.now() - datetime(2024, 1, 1)).days, 1), 2)
         }
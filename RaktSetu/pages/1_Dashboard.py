@@ -0,0 +1,110 @@
+"""
+Dashboard Page
+Real-time inventory status, charts and recommendations
+"""
+
+import streamlit as st
+import numpy as np
+import json
+from datetime import datetime
+
+from utils.frontend import (
+    setup_page, render_footer, get_inventory_status, paginate,
+    build_inventory_df, build_urgency_pie
+)
+
+setup_page()
+
+st.header("📊 Real-Time Dashboard")
+
+# Get inventory data
+inventory_data = get_inventory_status()
+
+if inventory_data:
+    inventory_items = inventory_data["inventory_status"]
+
+    # Create DataFrame (cached on the payload, so unchanged data is not rebuilt)
+    df_inventory = build_inventory_df(json.dumps(inventory_items))
+
+    # Overall health indicator
+    overall_health = inventory_data.get("overall_health", "unknown")
+    col1, col2, col3, col4 = st.columns(4)
+
+    with col1:
+        st.metric("Overall Health", overall_health.upper(),
+                 delta="Good" if overall_health == "healthy" else "Alert")
+
+    with col2:
+        st.metric("Critical Items", inventory_data.get("critical_count", 0))
+
+    with col3:
+        total_inventory = int(df_inventory["current_stock"].sum())
+        st.metric("Total Units", total_inventory)
+
+    with col4:
+        # Show when the data was produced, not when this rerun happened
+        fetched_at = inventory_data.get("timestamp")
+        last_updated = datetime.fromisoformat(fetched_at) if fetched_at else datetime.now()
+        st.metric("Last Updated", last_updated.strftime("%H:%M:%S"))
+
+    st.markdown("---")
+
+    # Inventory Status Table
+    st.subheader("📦 Current Inventory Status")
+
+    # Color code by urgency
+    def color_urgency_col(s):
+        return np.select(
+            [s == "critical", s == "high", s == "medium"],
+            ["background-color: #D62E0D", "background-color: #1BE038", "background-color: #d1ecf1"],
+            default="background-color: #FAEA02"
+        )
+
+    page_df = paginate(df_inventory[["blood_type", "current_stock", "safety_stock",
+                                     "optimal_stock", "urgency_level", "days_until_shortage"]],
+                       key="inventory_page")
+    styled_df = page_df.style.apply(
+        color_urgency_col, subset=["urgency_level"]
+    )
+
+    st.dataframe(styled_df, use_container_width=True)
+
+    # Visualization
+    col1, col2 = st.columns(2)
+
+    with col1:
+        # Stock levels bar chart
+        st.markdown("**Stock Levels by Blood Type**")
+        st.bar_chart(
+            df_inventory.set_index("blood_type")[["current_stock", "safety_stock"]],
+            x_label="Blood Type",
+            y_label="Units",
+            color=["#DC143C", "#FFD700"],
+            stack=False
+        )
+
+    with col2:
+        # Urgency pie chart
+        fig_urgency = build_urgency_pie(df_inventory)
+        st.plotly_chart(fig_urgency, use_container_width=True)
+
+    # Recommendations
+    st.subheader("💡 Recommendations")
+    critical_df = df_inventory[df_inventory["urgency_level"].isin(["critical", "high"])]
+
+    if not critical_df.empty:
+        is_critical = critical_df["urgency_level"].eq("critical")
+        # Build every box first and send them as a single element
+        blocks = [
+            f'<div class="danger-box">🚨 {recommendation}</div>' if critical
+            else f'<div class="warning-box">⚠️ {recommendation}</div>'
+            for recommendation, critical in zip(critical_df["recommendation"], is_critical)
+        ]
+        st.markdown("\n".join(blocks), unsafe_allow_html=True)
+    else:
+        st.markdown('<div class="success-box">✅ All blood types are at healthy levels!</div>', unsafe_allow_html=True)
+
+else:
+    st.error("Unable to fetch inventory data. Make sure the API is running.")
+
+render_footer()
@@ -0,0 +1,66 @@
+"""
+Demand Prediction Page
+AI-powered demand forecasting with confidence intervals
+"""
+
+import streamlit as st
+import pandas as pd
+
+from utils.frontend import setup_page, render_footer, predict_demand, build_forecast_figure
+
+setup_page()
+
+st.header("🔮 AI-Powered Demand Forecasting")
+
+col1, col2 = st.columns([1, 2])
+
+with col1:
+    st.subheader("Prediction Settings")
+
+    blood_type = st.selectbox(
+        "Select Blood Type",
+        ["O+", "O-", "A+", "A-", "B+", "B-", "AB+", "AB-"]
+    )
+
+    days_ahead = st.slider(
+        "Days to Predict",
+        min_value=1,
+        max_value=30,
+        value=7
+    )
+
+    if st.button("🔮 Predict Demand", type="primary"):
+        with st.spinner("Analyzing patterns and generating predictions..."):
+            prediction_data = predict_demand(blood_type, days_ahead)
+
+            if prediction_data:
+                st.session_state.prediction_data = prediction_data
+
+with col2:
+    if "prediction_data" in st.session_state:
+        pred_data = st.session_state.prediction_data
+
+        st.subheader(f"📈 Predictions for {pred_data['blood_type']}")
+
+        # Confidence score
+        st.metric("Model Confidence", f"{pred_data['confidence_score']:.1f}%")
+
+        # Predictions table
+        predictions = pred_data["predictions"]
+        df_pred = pd.DataFrame(predictions)
+
+        # Line chart
+        fig = build_forecast_figure(df_pred)
+        st.plotly_chart(fig, use_container_width=True)
+
+        # Alerts
+        if pred_data.get("alerts"):
+            st.subheader("🚨 Alerts")
+            for alert in pred_data["alerts"]:
+                st.warning(alert)
+
+        # Predictions table
+        st.subheader("📋 Detailed Forecast")
+        st.dataframe(df_pred, use_container_width=True)
+
+render_footer()
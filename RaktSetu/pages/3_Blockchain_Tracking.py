@@ -0,0 +1,135 @@
+"""
+Blockchain Tracking Page
+Register blood units on the blockchain and track their history
+"""
+
+import streamlit as st
+import orjson
+import pandas as pd
+
+from utils.frontend import setup_page, render_footer, api_get, create_blood_unit
+
+setup_page()
+
+st.header("⛓️ Blockchain Traceability System")
+
+tab1, tab2 = st.tabs(["🆕 Register New Unit", "🔍 Track Unit"])
+
+with tab1:
+    st.subheader("Register New Blood Unit")
+
+    col1, col2 = st.columns(2)
+
+    with col1:
+        donor_id = st.text_input("Donor ID", placeholder="D12345")
+        blood_type_bc = st.selectbox(
+            "Blood Type",
+            ["O+", "O-", "A+", "A-", "B+", "B-", "AB+", "AB-"],
+            key="bc_blood_type"
+        )
+
+    with col2:
+        location = st.text_input("Collection Location", placeholder="Main Blood Bank")
+
+    if st.button("📝 Register on Blockchain", type="primary"):
+        if donor_id and location:
+            with st.spinner("Creating blockchain record..."):
+                result = create_blood_unit(donor_id, blood_type_bc, location)
+
+                if result:
+                    st.success(f"✅ Blood unit registered successfully!")
+                    st.info(f"**Unit ID:** {result['unit_id']}")
+                    st.markdown(f"**Blood Type:** {result['blood_type']}")
+                    st.markdown(f"**Timestamp:** {result['timestamp']}")
+
+                    # Store in session
+                    st.session_state.last_unit_id = result['unit_id']
+                else:
+                    st.error("Failed to register unit. Check API connection.")
+        else:
+            st.error("Please fill in all fields")
+
+with tab2:
+    st.subheader("Track Blood Unit History")
+
+    # Pre-fill if we just created one
+    default_unit = st.session_state.get("last_unit_id", "")
+
+    unit_id = st.text_input("Enter Unit ID", value=default_unit, placeholder="UNIT-ABC123DEF456")
+
+    if st.button("🔍 Track Unit", type="primary"):
+        if unit_id:
+            try:
+                response = api_get(f"/api/v1/blockchain/unit/{unit_id}")
+
+                if response.status_code == 200:
+                    # Keep the result so paging through history survives reruns
+                    st.session_state.tracked_unit = orjson.loads(response.content)
+                else:
+                    st.session_state.pop("tracked_unit", None)
+                    st.error("Unit not found in blockchain")
+            except Exception as e:
+                st.error(f"Error: {str(e)}")
+        else:
+            st.warning("Please enter a Unit ID")
+
+    if "tracked_unit" in st.session_state:
+        data = st.session_state.tracked_unit
+
+        # Verification status
+        verification = data.get("verification", {})
+
+        if verification.get("verified"):
+            st.success("✅ Unit Verified - Authentic")
+        else:
+            st.error("❌ Verification Failed")
+
+        col1, col2, col3 = st.columns(3)
+        with col1:
+            st.metric("Total Records", data.get("total_records", 0))
+        with col2:
+            st.metric("Current Status", verification.get("current_status", "unknown").upper())
+        with col3:
+            st.metric("Blockchain Valid", "✅ Yes" if verification.get("blockchain_valid") else "❌ No")
+
+        # History timeline
+        st.subheader("📜 Complete History")
+
+        history = data.get("history", [])
+
+        if history:
+            # One table for the whole timeline; full details load on row selection
+            df_history = pd.DataFrame([
+                {
+                    "block": record["block_index"],
+                    "type": record["transaction"]["type"],
+                    "status": record["transaction"].get("status"),
+                    "timestamp": record["transaction"]["timestamp"],
+                    "block_hash": record["block_hash"]
+                }
+                for record in history
+            ])
+            df_history["timestamp"] = pd.to_datetime(df_history["timestamp"])
+
+            event = st.dataframe(
+                df_history,
+                use_container_width=True,
+                hide_index=True,
+                column_config={
+                    "timestamp": st.column_config.DatetimeColumn("Timestamp", format="YYYY-MM-DD HH:mm:ss"),
+                    "block_hash": st.column_config.TextColumn("Block Hash", width="medium")
+                },
+                on_select="rerun",
+                selection_mode="single-row",
+                key="history_table"
+            )
+
+            selected_rows = event.selection.rows
+            if selected_rows:
+                st.json(history[selected_rows[0]]["transaction"])
+            else:
+                st.caption("Select a row to view the full transaction")
+        else:
+            st.info("No history found for this unit")
+
+render_footer()
@@ -0,0 +1,108 @@
+"""
+Emergency Mode Page
+One-click emergency response and status
+"""
+
+import streamlit as st
+import pandas as pd
+
+from utils.frontend import (
+    setup_page, render_footer, fetch_all, activate_emergency,
+    get_notification_analytics
+)
+
+setup_page()
+
+st.header("🚨 Emergency Response System")
+
+st.warning("⚠️ Emergency Mode should only be activated for critical situations")
+
+# Load status and inventory together on first visit
+emergency_endpoints = {
+    "emergency_status": "/api/v1/emergency/status",
+    "emergency_inventory": "/api/v1/inventory/status"
+}
+missing = {key: path for key, path in emergency_endpoints.items() if key not in st.session_state}
+if missing:
+    for key, value in fetch_all(missing).items():
+        if value:
+            st.session_state[key] = value
+
+col1, col2 = st.columns([2, 1])
+
+with col1:
+    st.subheader("Activate Emergency Response")
+
+    event_type = st.selectbox(
+        "Event Type",
+        ["accident", "disaster", "outbreak", "festival"]
+    )
+
+    blood_types_needed = st.multiselect(
+        "Blood Types Needed",
+        ["O+", "O-", "A+", "A-", "B+", "B-", "AB+", "AB-"],
+        default=["O+", "O-"]
+    )
+
+    severity = st.select_slider(
+        "Severity Level",
+        options=["low", "medium", "high"],
+        value="high"
+    )
+
+    if st.button("🚨 ACTIVATE EMERGENCY MODE", type="primary"):
+        if blood_types_needed:
+            with st.spinner("Activating emergency response..."):
+                result = activate_emergency(event_type, blood_types_needed, severity)
+
+                if result:
+                    results = fetch_all(emergency_endpoints)
+                    st.session_state.update({key: value for key, value in results.items() if value})
+                    get_notification_analytics.clear()
+                    st.success("✅ Emergency Mode Activated!")
+
+                    st.markdown(f"**Event Type:** {result['event_type'].title()}")
+                    st.markdown(f"**Severity:** {result['severity'].upper()}")
+                    st.markdown(f"**Donors Contacted:** {result['donors_contacted']}")
+                    st.markdown(f"**Notifications Sent:** {result['notifications_sent']}")
+
+                    st.info(result['message'])
+
+                    # Show current inventory
+                    st.subheader("Current Inventory Status")
+                    inventory = result.get("current_inventory", [])
+
+                    df_inv = pd.DataFrame(inventory)
+                    if not df_inv.empty:
+                        st.dataframe(df_inv[["blood_type", "current_stock", "predicted_demand", "urgency_level"]],
+                                   use_container_width=True)
+                else:
+                    st.error("Failed to activate emergency mode")
+        else:
+            st.error("Please select at least one blood type")
+
+with col2:
+    st.subheader("Emergency Status")
+
+    if st.button("🔄 Refresh Status"):
+        results = fetch_all(emergency_endpoints)
+        if results["emergency_status"]:
+            st.session_state.update({key: value for key, value in results.items() if value})
+        else:
+            st.error("Failed to fetch status")
+
+    if "emergency_status" in st.session_state:
+        status = st.session_state.emergency_status
+
+        st.metric("System Status", status.get("status", "UNKNOWN"))
+        st.metric("Emergency Ready Donors", status.get("emergency_ready_donors", 0))
+        st.metric("Critical Items", len(status.get("critical_inventory", [])))
+
+    if "emergency_inventory" in st.session_state:
+        inventory = st.session_state.emergency_inventory.get("inventory_status", [])
+        stock = [item for item in inventory if item["blood_type"] in blood_types_needed]
+        if stock:
+            st.dataframe(pd.DataFrame(stock)[["blood_type", "current_stock", "urgency_level"]],
+                         use_container_width=True, hide_index=True)
+
+render_footer()
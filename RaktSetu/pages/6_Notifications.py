@@ -0,0 +1,108 @@
+"""
+Notifications Page
+Send donor notifications and view delivery analytics
+"""
+
+import streamlit as st
+import orjson
+import pandas as pd
+from datetime import datetime
+
+from utils.frontend import (
+    setup_page, render_footer, api_post, get_notification_analytics,
+    build_notification_type_pie
+)
+
+setup_page()
+
+st.header("🔔 Smart Notification System")
+
+tab1, tab2 = st.tabs(["📤 Send Notification", "📊 Analytics"])
+
+with tab1:
+    st.subheader("Send Notification")
+
+    notif_type = st.selectbox(
+        "Notification Type",
+        ["Urgency Alert", "Thank You", "Event Notification"]
+    )
+
+    if notif_type == "Urgency Alert":
+        col1, col2 = st.columns(2)
+
+        with col1:
+            blood_type_notif = st.selectbox(
+                "Blood Type",
+                ["O+", "O-", "A+", "A-", "B+", "B-", "AB+", "AB-"],
+                key="notif_blood_type"
+            )
+            units_needed = st.number_input("Units Needed", min_value=1, value=10)
+
+        with col2:
+            location_notif = st.text_input("Location", value="City Hospital")
+            urgency_level = st.selectbox("Urgency", ["low", "medium", "high", "critical"])
+
+        if st.button("📤 Send Alert", type="primary"):
+            try:
+                response = api_post(
+                    "/api/v1/notifications/urgency",
+                    json={
+                        "blood_type": blood_type_notif,
+                        "units_needed": units_needed,
+                        "location": location_notif,
+                        "urgency": urgency_level
+                    }
+                )
+
+                if response.status_code == 200:
+                    get_notification_analytics.clear()
+                    st.success("✅ Notification sent successfully!")
+                    result = orjson.loads(response.content)
+                    st.json(result.get("notification"))
+            except Exception as e:
+                st.error(f"Failed to send notification: {str(e)}")
+
+    elif notif_type == "Thank You":
+        donor_name = st.text_input("Donor Name")
+        blood_type_ty = st.selectbox("Blood Type", ["O+", "O-", "A+", "A-", "B+", "B-", "AB+", "AB-"], key="ty_blood")
+
+        if st.button("📤 Send Thank You", type="primary"):
+            try:
+                response = api_post(
+                    "/api/v1/notifications/thank-you",
+                    json={
+                        "donor_name": donor_name,
+                        "blood_type": blood_type_ty,
+                        "donation_date": datetime.now().strftime("%Y-%m-%d")
+                    }
+                )
+
+                if response.status_code == 200:
+                    get_notification_analytics.clear()
+                    st.success("✅ Thank you message sent!")
+            except Exception as e:
+                st.error(f"Failed to send: {str(e)}")
+
+with tab2:
+    st.subheader("Notification Analytics")
+
+    if st.button("📊 Load Analytics", type="primary"):
+        analytics = get_notification_analytics()
+        if analytics is not None:
+            st.session_state.notif_analytics = analytics
+        else:
+            st.error("Failed to load analytics")
+
+    if "notif_analytics" in st.session_state:
+        analytics = st.session_state.notif_analytics
+
+        st.metric("Total Notifications Sent", analytics.get("total_sent", 0))
+
+        # By type
+        if "by_type" in analytics:
+            st.subheader("By Type")
+            df_type = pd.DataFrame(list(analytics["by_type"].items()), columns=["Type", "Count"])
+            fig = build_notification_type_pie(df_type)
+            st.plotly_chart(fig, use_container_width=True)
+
+render_footer()
@@ -22,5 +22,6 @@ setup(
         "joblib>=1.3.0",
         "python-multipart>=0.0.6",
         "requests>=2.31.0",
+        "orjson>=3.9.0",
     ],
 )
@@ -41,50 +41,47 @@ def generate_historical_data(blood_type: str, days: int = 365) -> pd.DataFrame:
     
     date_range = pd.date_range(start=start_date, end=end_date, freq='D')
     
-    data = []
+    # Calendar features computed once for the whole range
+    n = len(date_range)
+    day_of_week = date_range.weekday.to_numpy()
+    month = date_range.month.to_numpy()
+    is_weekend = day_of_week >= 5
+    is_monsoon = np.isin(month, [6, 7, 8])  # Monsoon season - more accidents
+    is_festival = np.isin(month, [10, 11])  # Festival season - increased activity
+    is_winter = np.isin(month, [12, 1, 2])  # Winter - slightly lower
     
-    for date in date_range:
-        # Base demand
-        demand = base_demand
-        
-        # Day of week effect (higher on weekdays)
-        if date.weekday() < 5:  # Monday to Friday
-            demand *= random.uniform(1.1, 1.3)
-        else:  # Weekend
-            demand *= random.uniform(0.7, 0.9)
-        
-        # Monthly seasonal patterns
-        month = date.month
-        if month in [6, 7, 8]:  # Monsoon season - more accidents
-            demand *= random.uniform(1.2, 1.4)
-        elif month in [10, 11]:  # Festival season - increased activity
-            demand *= random.uniform(1.15, 1.35)
-        elif month in [12, 1, 2]:  # Winter - slightly lower
-            demand *= random.uniform(0.9, 1.0)
-        
-        # Add some random events (accidents, emergencies)
-        if random.random() < 0.05:  # 5% chance of spike
-            demand *= random.uniform(1.5, 2.5)
-        
-        # General random variation
-        demand *= random.uniform(0.85, 1.15)
-        
-        # Ensure positive integer
-        demand = max(1, int(round(demand)))
-        
-        data.append({
-            'date': date,
-            'demand': demand,
-            'day_of_week': date.weekday(),
-            'month': date.month,
-            'day': date.day,
-            'is_weekend': 1 if date.weekday() >= 5 else 0,
-            'is_monsoon': 1 if month in [6, 7, 8] else 0,
-            'is_festival': 1 if month in [10, 11] else 0,
-            'blood_type': blood_type
-        })
-    
-    df = pd.DataFrame(data)
+    rng = np.random.default_rng()
+    
+    # Day of week effect (higher on weekdays)
+    demand = base_demand * np.where(is_weekend, rng.uniform(0.7, 0.9, n), rng.uniform(1.1, 1.3, n))
+    
+    # Monthly seasonal patterns
+    demand *= np.select(
+        [is_monsoon, is_festival, is_winter],
+        [rng.uniform(1.2, 1.4, n), rng.uniform(1.15, 1.35, n), rng.uniform(0.9, 1.0, n)],
+        default=1.0
+    )
+    
+    # Add some random events (accidents, emergencies) - 5% chance of spike
+    demand *= np.where(rng.random(n) < 0.05, rng.uniform(1.5, 2.5, n), 1.0)
+    
+    # General random variation
+    demand *= rng.uniform(0.85, 1.15, n)
+    
+    # Ensure positive integer
+    demand = np.maximum(1, np.round(demand)).astype(int)
+    
+    df = pd.DataFrame({
+        'date': date_range,
+        'demand': demand,
+        'day_of_week': day_of_week,
+        'month': month,
+        'day': date_range.day.to_numpy(),
+        'is_weekend': is_weekend.astype(int),
+        'is_monsoon': is_monsoon.astype(int),
+        'is_festival': is_festival.astype(int),
+        'blood_type': blood_type
+    })
     return df
 
 
@@ -0,0 +1,353 @@
+"""
+Frontend Helpers
+Shared API client, cached builders and page layout for the Streamlit pages
+"""
+
+import streamlit as st
+import httpx
+import orjson
+import pandas as pd
+from datetime import datetime
+import asyncio
+import json
+import os
+
+# API Base URL
+API_BASE = "http://localhost:8000"
+
+# Default timeout (seconds) for API calls
+API_TIMEOUT = 10
+
+# Custom CSS lives in assets/style.css
+CSS_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "assets", "style.css")
+
+# Helper functions
+@st.cache_resource
+def get_http_client():
+    """Shared HTTP client so API calls reuse pooled keep-alive connections"""
+    return httpx.Client(
+        base_url=API_BASE,
+        timeout=API_TIMEOUT,
+        limits=httpx.Limits(max_connections=10, max_keepalive_connections=10)
+    )
+
+def api_get(path, **kwargs):
+    """GET an API endpoint over the shared client"""
+    return get_http_client().get(path, **kwargs)
+
+def api_post(path, **kwargs):
+    """POST to an API endpoint over the shared client"""
+    return get_http_client().post(path, **kwargs)
+
+def _get_json(path):
+    """GET an API endpoint and return its JSON body, or None on failure"""
+    try:
+        response = api_get(path)
+        if response.status_code == 200:
+            return orjson.loads(response.content)
+        return None
+    except:
+        return None
+
+async def fetch_json(client, semaphore, path, **kwargs):
+    """Async GET of an API endpoint, returning its JSON body or None on failure"""
+    async with semaphore:
+        try:
+            response = await client.get(path, **kwargs)
+            if response.status_code == 200:
+                return orjson.loads(response.content)
+            return None
+        except Exception:
+            return None
+
+async def _gather_json(paths):
+    """Issue all GETs on one event loop, at most 8 in flight"""
+    semaphore = asyncio.Semaphore(8)
+    # AsyncClient is bound to the event loop, so it lives for one fan-out
+    async with httpx.AsyncClient(base_url=API_BASE, timeout=API_TIMEOUT) as client:
+        return await asyncio.gather(*(fetch_json(client, semaphore, path) for path in paths))
+
+def fetch_all(endpoints):
+    """Fetch several independent API endpoints concurrently
+
+    Takes a {name: path} dict and returns {name: json or None}
+    """
+    # Skip the fan-out entirely when this rerun's ping already failed
+    if st.session_state.get("api_ok") is False:
+        return dict.fromkeys(endpoints)
+
+    results = asyncio.run(_gather_json(list(endpoints.values())))
+    return dict(zip(endpoints.keys(), results))
+
+# Everything the first paint of a page needs, fetched in one fan-out
+BOOTSTRAP_ENDPOINTS = {
+    "ping": "/",
+    "inventory": "/api/v1/inventory/status",
+    "segments": "/api/v1/donors/segments"
+}
+
+@st.cache_data(ttl=15)
+def get_bootstrap():
+    """
+    Ping, inventory and donor segments as concurrent GETs
+
+    The sidebar ping piggybacks on the same round trip as the page's
+    primary payload. A failed probe is cached too, so an offline API
+    costs one attempt per 15s window instead of one per rerun.
+    """
+    results = asyncio.run(_gather_json(list(BOOTSTRAP_ENDPOINTS.values())))
+    return dict(zip(BOOTSTRAP_ENDPOINTS.keys(), results))
+
+def check_api_connection():
+    """Check if API is running"""
+    return get_bootstrap()["ping"] is not None
+
+def get_inventory_status():
+    """Get current inventory status"""
+    return get_bootstrap()["inventory"]
+
+def predict_demand(blood_type, days_ahead):
+    """Predict blood demand"""
+    try:
+        response = api_post(
+            "/api/v1/predict",
+            json={"blood_type": blood_type, "days_ahead": days_ahead}
+        )
+        if response.status_code == 200:
+            return orjson.loads(response.content)
+        return None
+    except:
+        return None
+
+def get_donor_segments():
+    """Get donor segmentation"""
+    return get_bootstrap()["segments"]
+
+@st.cache_data(ttl=300)
+def get_retention_metrics():
+    """Get donor retention metrics"""
+    return _get_json("/api/v1/donors/retention")
+
+@st.cache_data(ttl=300)
+def get_geographic_distribution():
+    """Get geographic distribution of donors"""
+    return _get_json("/api/v1/donors/geographic-heatmap")
+
+@st.cache_data(ttl=60)
+def get_notification_analytics():
+    """Get notification analytics"""
+    data = _get_json("/api/v1/notifications/analytics")
+    return data.get("analytics", {}) if data else None
+
+def activate_emergency(event_type, blood_types, severity):
+    """Activate emergency mode"""
+    try:
+        response = api_post(
+            "/api/v1/emergency/activate",
+            json={
+                "event_type": event_type,
+                "blood_types_needed": blood_types,
+                "severity": severity
+            }
+        )
+        if response.status_code == 200:
+            return orjson.loads(response.content)
+        return None
+    except:
+        return None
+
+def create_blood_unit(donor_id, blood_type, location):
+    """Create blood unit on blockchain"""
+    try:
+        response = api_post(
+            "/api/v1/blockchain/unit/create",
+            json={
+                "donor_id": donor_id,
+                "blood_type": blood_type,
+                "collection_date": datetime.now().strftime("%Y-%m-%d"),
+                "location": location
+            }
+        )
+        if response.status_code == 200:
+            return orjson.loads(response.content)
+        return None
+    except:
+        return None
+
+def paginate(items, key, page_size_options=(25, 50, 100)):
+    """
+    Return only the selected page of a list or DataFrame
+
+    Just the visible slice is rendered and serialized to the browser,
+    instead of the full table on every rerun.
+    """
+    total = len(items)
+    if total <= page_size_options[0]:
+        return items
+
+    col1, col2, col3 = st.columns([1, 1, 2])
+    with col1:
+        page_size = st.selectbox("Rows per page", page_size_options, key=f"{key}_size")
+    num_pages = (total - 1) // page_size + 1
+    with col2:
+        page_num = st.number_input("Page", min_value=1, max_value=num_pages, value=1, key=key)
+    start = (min(page_num, num_pages) - 1) * page_size
+    end = min(start + page_size, total)
+    with col3:
+        st.caption(f"Showing {start + 1}-{end} of {total}")
+
+    if isinstance(items, pd.DataFrame):
+        return items.iloc[start:end]
+    return items[start:end]
+
+# Cached DataFrame/figure builders
+def _hash_frame(df):
+    """Content hash so figure builders are keyed on the data they plot"""
+    return hash(pd.util.hash_pandas_object(df).values.tobytes())
+
+FRAME_HASH_FUNCS = {pd.DataFrame: _hash_frame}
+
+INVENTORY_COLUMNS = ["blood_type", "current_stock", "safety_stock", "optimal_stock",
+                     "urgency_level", "days_until_shortage", "recommendation"]
+INVENTORY_DTYPES = {
+    "blood_type": "category",
+    "urgency_level": "category",
+    "current_stock": "int32",
+    "safety_stock": "int32",
+    "optimal_stock": "int32",
+    "days_until_shortage": "Int16"
+}
+
+@st.cache_data
+def build_inventory_df(inventory_items_json):
+    """Build the inventory DataFrame from the JSON-encoded status list"""
+    # Known schema: skip dtype inference and keep the Arrow payload small.
+    # days_until_shortage is nullable (no demand -> None), hence Int16.
+    return pd.DataFrame.from_records(
+        json.loads(inventory_items_json), columns=INVENTORY_COLUMNS
+    ).astype(INVENTORY_DTYPES)
+
+@st.cache_data
+def build_segments_series(summary_items):
+    """Donor counts per segment; takes summary.items() as a tuple so it hashes"""
+    segments, counts = zip(*summary_items) if summary_items else ((), ())
+    return pd.Series(counts, index=pd.Index(segments, name="segment"), name="Number of Donors")
+
+@st.cache_data(hash_funcs=FRAME_HASH_FUNCS)
+def build_urgency_pie(df_inventory):
+    """Pie chart of blood types by urgency level"""
+    import plotly.express as px
+
+    urgency_counts = df_inventory["urgency_level"].value_counts()
+    fig_urgency = px.pie(
+        values=urgency_counts.values,
+        names=urgency_counts.index,
+        title="Inventory by Urgency Level",
+        color=urgency_counts.index,
+        color_discrete_map={
+            "critical": "#dc3545",
+            "high": "#28a745",
+            "medium": "#17a2b8",
+            "low": "#FAEA02"
+        }
+    )
+    return fig_urgency
+
+@st.cache_data(hash_funcs=FRAME_HASH_FUNCS)
+def build_forecast_figure(df_pred):
+    """Demand forecast line chart with a shaded confidence interval"""
+    import plotly.graph_objects as go
+
+    fig = go.Figure()
+    fig.add_trace(go.Scatter(
+        x=df_pred["date"],
+        y=df_pred["predicted_demand"],
+        mode="lines+markers",
+        name="Predicted Demand",
+        line=dict(color="#DC143C", width=3),
+        marker=dict(size=8)
+    ))
+
+    # Add confidence interval
+    fig.add_trace(go.Scatter(
+        x=df_pred["date"],
+        y=df_pred["confidence_upper"],
+        mode="lines",
+        name="Upper Bound",
+        line=dict(width=0),
+        showlegend=False
+    ))
+    fig.add_trace(go.Scatter(
+        x=df_pred["date"],
+        y=df_pred["confidence_lower"],
+        mode="lines",
+        name="Confidence Interval",
+        fill="tonexty",
+        line=dict(width=0),
+        fillcolor="rgba(220, 20, 60, 0.2)"
+    ))
+
+    fig.update_layout(
+        title="Demand Forecast",
+        xaxis_title="Date",
+        yaxis_title="Units Needed",
+        hovermode="x unified"
+    )
+    return fig
+
+@st.cache_data(hash_funcs=FRAME_HASH_FUNCS)
+def build_notification_type_pie(df_type):
+    """Pie chart of notifications sent by type"""
+    import plotly.express as px
+
+    return px.pie(df_type, values="Count", names="Type", title="Notifications by Type")
+
+@st.cache_resource
+def load_css():
+    """Read the stylesheet once per server process, ready for injection"""
+    with open(CSS_PATH, encoding="utf-8") as f:
+        return f"<style>\n{f.read()}</style>"
+
+def setup_page():
+    """Page config, CSS, sidebar and header shared by every page"""
+    st.set_page_config(
+        page_title="RaktSetu AI",
+        page_icon="🩸",
+        layout="wide",
+        initial_sidebar_state="expanded"
+    )
+
+    st.markdown(load_css(), unsafe_allow_html=True)
+
+    with st.sidebar:
+        st.title("🩸 RaktSetu AI")
+        st.markdown("---")
+
+        # API Status (probed once per rerun and shared with the page)
+        st.session_state.api_ok = check_api_connection()
+        if st.session_state.api_ok:
+            st.success("✅ API Connected")
+        else:
+            st.error("❌ API Offline")
+            st.warning("Start the API server:\n```bash\npython main.py\n```")
+
+        # Drop cached API responses and fetch fresh data
+        if st.button("🔄 Refresh Data"):
+            st.cache_data.clear()
+            st.rerun()
+
+    # Main content
+    st.markdown('<h1 class="main-header">🩸 RaktSetu AI - Intelligent Blood Bank Management</h1>', unsafe_allow_html=True)
+
+def render_footer():
+    """Footer shared by every page"""
+    st.markdown("---")
+    st.markdown(
+        """
+        <div style='text-align: center; color: #666;'>
+            <p>🩸 RaktSetu AI - Intelligent Blood Bank Management System</p>
+            <p>Powered by AI, Blockchain & Data Analytics</p>
+        </div>
+        """,
+        unsafe_allow_html=True
+    )